@@ -268,6 +268,17 @@ Services = Literal[Clients, Resources]
 ClientType = TypeVar("ClientType", bound=BaseClient)
 ResourceType = TypeVar("ResourceType", bound=ServiceResource)
 
+# Default config for clients and resources that do not set one. Uses "standard" retry mode
+# (default is "legacy") and increases the number of retries to 5 (default is 3)
+# See: https://boto3.amazonaws.com/v1/documentation/api/latest/guide/retries.html#available-retry-modes
+# TCP keep-alive keeps pooled connections of these (cached) clients from going stale.
+_DEFAULT_BOTO3_CONFIG = Config(
+    connect_timeout=120,
+    read_timeout=120,
+    retries={"max_attempts": 6, "mode": "standard"},
+    tcp_keepalive=True,
+)
+
 
 @cache
 def get_client(
@@ -297,18 +308,12 @@ def get_client(
     if region_name:
         kwargs["region_name"] = region_name
 
-    # If config for our client is not set, we want to set it to use "standard" mode
-    # (default is "legacy") and increase the number of retries to 5 (default is 3)
-    # See: https://boto3.amazonaws.com/v1/documentation/api/latest/guide/retries.html#available-retry-modes
     config: Optional[Config] = kwargs.pop("config", None)
-    default_config = Config(
-        connect_timeout=120, read_timeout=120, retries={"max_attempts": 6, "mode": "standard"}
-    )
     if config is None:
-        config = default_config
+        config = _DEFAULT_BOTO3_CONFIG
     else:
-        # Have values in pre-existing config (if it exists) take precedence over default_config
-        config = default_config.merge(other_config=config)
+        # Have values in pre-existing config (if it exists) take precedence over the default
+        config = _DEFAULT_BOTO3_CONFIG.merge(other_config=config)
 
     session = session or boto3.Session()
     return session.client(service, config=config, **kwargs)
@@ -342,18 +347,12 @@ def get_resource(
     if region_name:
         kwargs["region_name"] = region_name
 
-    # If config for our client is not set, we want to set it to use "standard" mode
-    # (default is "legacy") and increase the number of retries to 5 (default is 3)
-    # See: https://boto3.amazonaws.com/v1/documentation/api/latest/guide/retries.html#available-retry-modes
     config: Optional[Config] = kwargs.pop("config", None)
-    default_config = Config(
-        connect_timeout=120, read_timeout=120, retries={"max_attempts": 6, "mode": "standard"}
-    )
     if config is None:
-        config = default_config
+        config = _DEFAULT_BOTO3_CONFIG
     else:
-        # Have values in pre-existing config (if it exists) take precedence over default_config
-        config = default_config.merge(other_config=config)
+        # Have values in pre-existing config (if it exists) take precedence over the default
+        config = _DEFAULT_BOTO3_CONFIG.merge(other_config=config)
 
     session = session or boto3.Session()
     return session.resource(service, config=config, **kwargs)
@@ -4,14 +4,16 @@ __all__ = ["BaseFileSystem", "LocalFileSystem", "S3FileSystem"]
 
 import errno
 import os
+import sys
+import threading
 from abc import abstractmethod
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
-import pytz
 from aibs_informatics_core.models.aws.efs import EFSPath
 from aibs_informatics_core.models.aws.s3 import S3URI
 from aibs_informatics_core.models.base import CustomAwareDateTime, custom_field
@@ -22,12 +24,15 @@ from aibs_informatics_core.utils.time import BEGINNING_OF_TIME
 from aibs_informatics_core.utils.tools.strtools import removeprefix
 
 from aibs_informatics_aws_utils.efs import get_efs_path, get_local_path
-from aibs_informatics_aws_utils.s3 import get_s3_resource
+from aibs_informatics_aws_utils.s3 import get_s3_client
 
 logger = get_logger(__name__)
 
 SEP = "/"
 
+# Slotted dataclasses (Python 3.10+) avoid a per-instance __dict__, which adds up for large trees
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 @dataclass
 class PathStats(SchemaModel):
@@ -36,7 +41,7 @@ class PathStats(SchemaModel):
     last_modified: datetime = custom_field(mm_field=CustomAwareDateTime())
 
 
-@dataclass(order=True)
+@dataclass(order=True, **_DATACLASS_SLOTS)
 class Node:
     """Represents an object or folder in an file system path.
 
@@ -59,6 +64,7 @@ class Node:
     last_modified: datetime = field(default=BEGINNING_OF_TIME)
     is_path_part_prefix: bool = field(default=False)
     is_path_part_suffix: bool = field(default=False)
+    _path_stats: Optional[PathStats] = field(default=None, init=False, repr=False, compare=False)
 
     def __hash__(self) -> int:
         return hash(self.path)
@@ -87,11 +93,13 @@ class Node:
 
     @property
     def path_stats(self) -> PathStats:
-        return PathStats(
-            size_bytes=self.size_bytes,
-            object_count=self.object_count,
-            last_modified=self.last_modified,
-        )
+        if self._path_stats is None:
+            self._path_stats = PathStats(
+                size_bytes=self.size_bytes,
+                object_count=self.object_count,
+                last_modified=self.last_modified,
+            )
+        return self._path_stats
 
     @property
     def depth(self) -> int:
@@ -101,20 +109,86 @@ class Node:
         return not (len(self.children) < 1)
 
     def add_object(self, path: str, size: int, last_modified: datetime):
-        def _add_object(node: Node, path: Optional[str]):
+        # TODO: Right now, we cannot support non-folder prefixes
+        path = path.lstrip(SEP)
+
+        node = self
+        node._update_stats(size=size, last_modified=last_modified)
+
+        # Walk the key parts by index rather than splitting the path into a list
+        start = 0
+        while True:
+            end = path.find(SEP, start)
+            key_part = path[start:] if end < 0 else path[start:end]
+            if key_part:
+                child = node.children.get(key_part)
+                if child is None:
+                    # Nodes only store their own key part (full paths are derived from
+                    # parents), and interning shares the many repeated key parts in a tree.
+                    key_part = sys.intern(key_part)
+                    child = node.children[key_part] = Node(path_part=key_part, parent=node)
+                node = child
             node._update_stats(size=size, last_modified=last_modified)
-            if path is None:
-                return
+            if end < 0:
+                break
+            start = end + 1
 
-            first_key_part, remaining_key = path.split(SEP, 1) if SEP in path else (path, None)
-            if first_key_part:
-                if first_key_part not in node.children:
-                    node.children[first_key_part] = Node(path_part=first_key_part, parent=node)
-                node = node.children[first_key_part]
-            _add_object(node, remaining_key)
+    def add_objects(self, objects: Iterable[Tuple[str, int, datetime]]):
+        """Adds many objects to the tree at once.
 
-        # TODO: Right now, we cannot support non-folder prefixes
-        _add_object(self, path.lstrip(SEP))
+        This is equivalent to calling `add_object` for every (path, size, last_modified)
+        entry, but entries are grouped by their next key part so that each node looks up
+        its children and updates its stats once per batch rather than once per object.
+        The whole batch is held in memory while it is grouped, so very large listings
+        should be added in several batches (e.g. one per listing page).
+
+        Args:
+            objects: (path, size, last_modified) entries relative to this node.
+        """
+        entries: List[Tuple[Optional[str], int, datetime]] = [
+            (path.lstrip(SEP), size, last_modified) for path, size, last_modified in objects
+        ]
+        unvisited: List[Tuple[Node, List[Tuple[Optional[str], int, datetime]]]] = [(self, entries)]
+        while unvisited:
+            node, entries = unvisited.pop()
+            children = node.children
+            size_bytes = 0
+            object_count = 0
+            last_modified = node.last_modified
+            grouped_entries: Dict[str, Tuple[Node, List[Tuple[Optional[str], int, datetime]]]]
+            grouped_entries = {}
+            for path, size, obj_last_modified in entries:
+                if last_modified < obj_last_modified:
+                    last_modified = obj_last_modified
+                # Every visit to a node counts towards its stats, including the repeat
+                # visits for empty key parts that `add_object` also makes.
+                size_bytes += size
+                object_count += 1
+                while path is not None:
+                    key_part, sep, remaining_path = path.partition(SEP)
+                    path = remaining_path if sep else None
+                    if not key_part:
+                        size_bytes += size
+                        object_count += 1
+                        continue
+                    # Children are created on first sight so they keep `add_object`'s order
+                    child = children.get(key_part)
+                    if child is None:
+                        key_part = sys.intern(key_part)
+                        child = children[key_part] = Node(path_part=key_part, parent=node)
+                    if path is None:
+                        # Leaf objects need no further grouping
+                        child._update_stats(size=size, last_modified=obj_last_modified)
+                    elif key_part in grouped_entries:
+                        grouped_entries[key_part][1].append((path, size, obj_last_modified))
+                    else:
+                        grouped_entries[key_part] = (child, [(path, size, obj_last_modified)])
+                    break
+            if object_count:
+                node._update_stats(
+                    size=size_bytes, last_modified=last_modified, object_count=object_count
+                )
+            unvisited.extend(grouped_entries.values())
 
     def get(self, key: str) -> Optional["Node"]:
         try:
@@ -123,15 +197,23 @@ class Node:
             return None
 
     def list_nodes(self) -> List["Node"]:
-        nodes = [self]
-        for _, n in self.children.items():
-            nodes.extend(n.list_nodes())
+        # Iterative pre-order traversal; children are pushed in reverse so that
+        # they are visited in insertion order.
+        nodes: List[Node] = []
+        unvisited_nodes = [self]
+        while unvisited_nodes:
+            node = unvisited_nodes.pop()
+            nodes.append(node)
+            unvisited_nodes.extend(reversed(node.children.values()))
         return nodes
 
-    def _update_stats(self, size: int, last_modified: datetime):
+    def _update_stats(self, size: int, last_modified: datetime, object_count: int = 1):
+        # Invalidate the cached path stats, as they are about to change
+        self._path_stats = None
         # For each node, update the current node's stats
         self.size_bytes += size
-        self.object_count += 1
+        self.object_count += object_count
+        # Only a reference is kept, so a leaf and its ancestors share one datetime object
         if self.last_modified < last_modified:
             self.last_modified = last_modified
 
@@ -192,26 +274,40 @@ class BaseFileSystem:
         Returns:
             List of nodes representing the partition.
         """
-        unchecked_nodes = {self.node}
-        size_bytes_exceeding_obj_nodes = []
-
+        size_bytes_exceeding_obj_nodes: List[Node] = []
         partitioned_nodes: List[Node] = []
         logger.info(
             f"Partitioning nodes with size_bytes_limit={size_bytes_limit} "
             f"and object_count_limit={object_count_limit}"
         )
 
+        def exceeds_limits(node: Node) -> bool:
+            return bool(
+                (size_bytes_limit and node.size_bytes > size_bytes_limit)
+                or (object_count_limit and node.object_count > object_count_limit)
+            )
+
+        # Only nodes that exceed the limits are ever queued. All children of such a node
+        # are classified in a single pass: those that fit are partitions as-is, and only
+        # the ones that still exceed the limits are descended into.
+        # NOTE: a plain list is used as the stack because hashing a Node requires
+        #       building its full path, which walks all the way up to the root.
+        unchecked_nodes: List[Node] = []
+        if exceeds_limits(self.node):
+            unchecked_nodes.append(self.node)
+        else:
+            partitioned_nodes.append(self.node)
+
         while unchecked_nodes:
             unchecked_node = unchecked_nodes.pop()
-            if (size_bytes_limit and unchecked_node.size_bytes > size_bytes_limit) or (
-                object_count_limit and unchecked_node.object_count > object_count_limit
-            ):
-                if unchecked_node.has_children():
-                    unchecked_nodes.update(unchecked_node.children.values())
+            if not unchecked_node.has_children():
+                size_bytes_exceeding_obj_nodes.append(unchecked_node)
+                continue
+            for child_node in unchecked_node.children.values():
+                if exceeds_limits(child_node):
+                    unchecked_nodes.append(child_node)
                 else:
-                    size_bytes_exceeding_obj_nodes.append(unchecked_node)
-            else:
-                partitioned_nodes.append(unchecked_node)
+                    partitioned_nodes.append(child_node)
 
         if size_bytes_exceeding_obj_nodes:
             msg = (
@@ -240,15 +336,18 @@ class LocalFileSystem(BaseFileSystem):
 
     def refresh(self, **kwargs):
         self.node = self.initialize_node()
+        objects: List[Tuple[str, int, datetime]] = []
         paths_to_visit = deque(find_all_paths(self.path, include_dirs=False, include_files=True))
         while paths_to_visit:
             path = paths_to_visit.popleft()
             try:
                 path_stats = Path(path).stat()
-                self.node.add_object(
-                    path=removeprefix(path, str(self.path) + os.sep),
-                    size=path_stats.st_size,
-                    last_modified=datetime.fromtimestamp(path_stats.st_mtime, tz=pytz.UTC),
+                objects.append(
+                    (
+                        removeprefix(path, str(self.path) + os.sep),
+                        path_stats.st_size,
+                        datetime.fromtimestamp(path_stats.st_mtime, tz=timezone.utc),
+                    )
                 )
             except FileNotFoundError:
                 logger.warning(f"{path} does not exist. Not adding to {self}")
@@ -264,6 +363,7 @@ class LocalFileSystem(BaseFileSystem):
                 else:
                     logger.error(f"Unexpected error raised for {path}. Reason: {ose}")
                     raise ose
+        self.node.add_objects(objects)
 
     @classmethod
     def from_path(cls, path: Union[str, Path], **kwargs) -> LocalFileSystem:
@@ -309,17 +409,64 @@ class S3FileSystem(BaseFileSystem):
     def initialize_node(self) -> Node:
         return Node(path_part=self.key)
 
-    def refresh(self, **kwargs):
+    def refresh(self, concurrent: bool = False, max_workers: Optional[int] = None, **kwargs):
+        """Rebuilds the tree from the objects under the S3 path.
+
+        By default, every object under the key is fetched with a single flat listing
+        (no delimiter), so the number of requests does not grow with the depth of the tree.
+        Each page of the listing is added to the tree as it arrives, so at most one page of
+        listed objects is held in memory alongside the tree.
+
+        Args:
+            concurrent: If True, the immediate sub-prefixes of the key are listed in
+                parallel, each worker still adding one page at a time to the tree.
+                Useful for prefixes with many sub-prefixes. Defaults to False.
+            max_workers: Number of worker threads used when `concurrent` is True.
+                Defaults to None (ThreadPoolExecutor default).
+            **kwargs: Additional arguments passed to the S3 client.
+        """
         self.node = self.initialize_node()
-        s3 = get_s3_resource(**kwargs)
-        bucket = s3.Bucket(self.bucket)
-
-        for obj in bucket.objects.filter(Prefix=self.key):
-            self.node.add_object(
-                path=removeprefix(obj.key, self.key),
-                size=obj.size,
-                last_modified=obj.last_modified,
-            )
+        s3 = get_s3_client(**kwargs)
+
+        if not concurrent:
+            for contents in self._iter_pages(s3, prefix=self.key):
+                self._add_objects(contents)
+            return
+
+        # List objects at the top level and collect the sub-prefixes to fan out over.
+        sub_prefixes: List[str] = []
+        paginator = s3.get_paginator("list_objects_v2")
+        for response in paginator.paginate(Bucket=self.bucket, Prefix=self.key, Delimiter=SEP):
+            self._add_objects(response.get("Contents", []))
+            sub_prefixes.extend(_["Prefix"] for _ in response.get("CommonPrefixes", []))
+
+        # Workers add each page to the tree as it arrives; the lock serializes tree updates.
+        lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._add_prefix_objects, s3, prefix=sub_prefix, lock=lock)
+                for sub_prefix in sub_prefixes
+            ]
+            for future in as_completed(futures):
+                future.result()
+
+    def _iter_pages(self, s3, prefix: str) -> Iterator[List[Dict[str, Any]]]:
+        # Consume raw list_objects_v2 pages rather than the resource API's
+        # ObjectSummary objects, which are costly to build for large prefixes.
+        paginator = s3.get_paginator("list_objects_v2")
+        for response in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            yield response.get("Contents", [])
+
+    def _add_prefix_objects(self, s3, prefix: str, lock: threading.Lock):
+        for contents in self._iter_pages(s3, prefix=prefix):
+            with lock:
+                self._add_objects(contents)
+
+    def _add_objects(self, objects: Iterable[Mapping[str, Any]]):
+        self.node.add_objects(
+            (removeprefix(obj["Key"], self.key), obj["Size"], obj["LastModified"])
+            for obj in objects
+        )
 
     @classmethod
     def from_path(cls, path: str, **kwargs) -> S3FileSystem:
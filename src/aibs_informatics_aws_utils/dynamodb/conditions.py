@@ -1,7 +1,22 @@
+import functools
 import re
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Match, Optional, Union, cast
+from decimal import Decimal
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Match,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from aibs_informatics_core.collections import ValidatedStr
 from aibs_informatics_core.models.aws.dynamodb import (
@@ -80,9 +95,9 @@ class UpdateExpressionComponents(ExpressionComponentsBase):
 
     @classmethod
     def from_dict(cls, attributes: Mapping[str, Any]) -> "UpdateExpressionComponents":
-        expression_attr_names = {}
-        expression_attr_values = {}
-        update_expressions = []
+        expression_attr_names: Dict[str, str] = {}
+        expression_attr_values: Dict[str, Any] = {}
+        update_expressions: List[str] = []
         for i, (attr_name, attr_value) in enumerate(attributes.items()):
             attr_name_key = f"#n{i}"
             attr_value_key = f":v{i}"
@@ -90,7 +105,7 @@ class UpdateExpressionComponents(ExpressionComponentsBase):
             expression_attr_values[attr_value_key] = attr_value
             update_expressions.append(f"{attr_name_key} = {attr_value_key}")
         update_expression = "SET " + ", ".join(update_expressions)
-        return UpdateExpressionComponents(
+        return cls(
             expression=update_expression,
             expression_attribute_names=expression_attr_names,
             expression_attribute_values=expression_attr_values,
@@ -119,13 +134,18 @@ class ConditionExpressionComponents(ExpressionComponentsBase):
         Returns:
             The created ConditionExpressionComponents.
         """
-        builder = ConditionExpressionBuilder()
-        bce = builder.build_expression(condition, is_key_condition=is_key_condition)
-
+        cache_key = _get_condition_cache_key(condition)
+        if cache_key is None:
+            # Condition holds values that are not safe to cache (e.g. lists, floats)
+            return _build_condition_expression_components(condition, is_key_condition)
+        cached = _get_condition_expression_components__cached(
+            condition, is_key_condition, cache_key
+        )
+        # Hand out a copy so callers cannot mutate the cached instance
         return ConditionExpressionComponents(
-            expression=bce.condition_expression,
-            expression_attribute_names=cast(Dict[str, str], bce.attribute_name_placeholders),
-            expression_attribute_values=cast(Dict[str, Any], bce.attribute_value_placeholders),
+            expression=cached.expression,
+            expression_attribute_names=dict(cached.expression_attribute_names),
+            expression_attribute_values=dict(cached.expression_attribute_values),
         )
 
     def fix_collisions(
@@ -160,50 +180,156 @@ class ConditionExpressionComponents(ExpressionComponentsBase):
             The other, as a modified non-overlapping Expression Condition.
         """
 
-        this_placeholder_names = AttrPlaceholder.sorted(self.expression_attribute_names.keys())
-        this_placeholder_values = AttrPlaceholder.sorted(self.expression_attribute_values.keys())
+        # Placeholders are handled as plain (prefix, number) pairs; building AttrPlaceholder
+        # instances re-validates every string, which dominates for large expressions.
+        pattern = AttrPlaceholder.regex_pattern
+
+        # Highest number in use per prefix, across both expressions
+        prefix_max_num_map: Dict[str, int] = defaultdict(int)
+        for placeholder in (
+            *self.expression_attribute_names,
+            *self.expression_attribute_values,
+            *other.expression_attribute_names,
+            *other.expression_attribute_values,
+        ):
+            prefix, number = _split_placeholder(placeholder)
+            if prefix_max_num_map[prefix] < int(number):
+                prefix_max_num_map[prefix] = int(number)
+
+        # Colliding placeholders are renumbered past the current max of their prefix,
+        # in order of appearance so the result is deterministic.
+        update_map: Dict[str, str] = {}
+        for this_placeholders, other_placeholders in (
+            (self.expression_attribute_names, other.expression_attribute_names),
+            (self.expression_attribute_values, other.expression_attribute_values),
+        ):
+            for placeholder in other_placeholders:
+                if placeholder in this_placeholders:
+                    prefix, _ = _split_placeholder(placeholder)
+                    prefix_max_num_map[prefix] += 1
+                    update_map[placeholder] = f"{prefix}{prefix_max_num_map[prefix]}"
+
+        def _fetch(m: Match) -> str:
+            return update_map.get(m.group(0), m.group(0))
+
+        # Now build the new expression components object (single pass over the expression)
+        return ConditionExpressionComponents(
+            expression=pattern.sub(_fetch, other.condition_expression),
+            expression_attribute_names={
+                update_map.get(p, p): v for p, v in other.expression_attribute_names.items()
+            },
+            expression_attribute_values={
+                update_map.get(p, p): v for p, v in other.expression_attribute_values.items()
+            },
+        )
 
-        other_placeholder_names = AttrPlaceholder.sorted(other.expression_attribute_names.keys())
-        other_placeholder_values = AttrPlaceholder.sorted(other.expression_attribute_values.keys())
 
-        prefix_max_num_map = AttrPlaceholder.build_prefix_max_number_map(
-            *this_placeholder_names,
-            *this_placeholder_values,
-            *other_placeholder_names,
-            *other_placeholder_values,
-        )
+# Only values of these exact types are cached; their (type, value) pair fully determines
+# how they serialize, and none of them can be mutated after the condition is built.
+_CACHEABLE_CONDITION_VALUE_TYPES = (str, int, bool, bytes, Decimal, type(None))
 
-        # Colliding placeholders
-        intersect_names = set(this_placeholder_names).intersection(other_placeholder_names)
-        intersect_values = set(this_placeholder_values).intersection(other_placeholder_values)
 
-        # create mapping for placeholder updates
-        update_map: Dict[AttrPlaceholder, AttrPlaceholder] = {}
+def _get_condition_cache_key(condition: ConditionBase) -> Optional[Hashable]:
+    """Build a structural key for a condition tree.
 
-        # Now create new placeholders for colliding placeholders,
-        # and add to the placeholder update mapping.
-        for placeholder in intersect_names.union(intersect_values):
-            prefix_max_num_map[placeholder.prefix] += 1
-            update_map[placeholder] = AttrPlaceholder.from_components(
-                placeholder.prefix, prefix_max_num_map[placeholder.prefix]
-            )
+    Returns:
+        The key, or None if the condition holds values that should not be cached.
+    """
+    expression = condition.get_expression()
+    values_key = []
+    for value in expression["values"]:
+        value_key = _get_condition_value_cache_key(value)
+        if value_key is None:
+            return None
+        values_key.append(value_key)
+    return (expression["format"], expression["operator"], tuple(values_key))
+
+
+def _get_condition_value_cache_key(value: Any) -> Optional[Hashable]:
+    if isinstance(value, ConditionBase):
+        return _get_condition_cache_key(value)
+    if isinstance(value, AttributeBase):
+        return (type(value).__name__, value.name)
+    if type(value) not in _CACHEABLE_CONDITION_VALUE_TYPES:
+        return None
+    if isinstance(value, Decimal):
+        # Decimal("1.5") == Decimal("1.50"), but they serialize differently
+        return (Decimal, str(value))
+    # The type keeps equal values of different types apart (e.g. True vs 1)
+    return (type(value), value)
 
-        def _fetch(m: Match) -> AttrPlaceholder:
-            ap = AttrPlaceholder(m.group(0))
-            return update_map.get(ap, ap)
 
-        # Now build the new expression components object
-        return ConditionExpressionComponents(
-            expression=re.sub(AttrPlaceholder.regex_pattern, _fetch, other.condition_expression),
-            expression_attribute_names={
-                update_map.get(AttrPlaceholder(p), p): other.expression_attribute_names[p]
-                for p in other.expression_attribute_names
-            },
-            expression_attribute_values={
-                update_map.get(AttrPlaceholder(p), p): other.expression_attribute_values[p]
-                for p in other.expression_attribute_values
-            },
-        )
+def _build_condition_expression_components(
+    condition: ConditionBase, is_key_condition: bool
+) -> ConditionExpressionComponents:
+    builder = ConditionExpressionBuilder()
+    bce = builder.build_expression(condition, is_key_condition=is_key_condition)
+
+    return ConditionExpressionComponents(
+        expression=bce.condition_expression,
+        expression_attribute_names=cast(Dict[str, str], bce.attribute_name_placeholders),
+        expression_attribute_values=cast(Dict[str, Any], bce.attribute_value_placeholders),
+    )
+
+
+_CONDITION_EXPRESSION_COMPONENTS_CACHE: Dict[Hashable, ConditionExpressionComponents] = {}
+_CONDITION_EXPRESSION_COMPONENTS_CACHE_MAXSIZE = 1024
+_CONDITION_EXPRESSION_COMPONENTS_CACHE_LOCK = threading.Lock()
+
+
+def _get_condition_expression_components__cached(
+    condition: ConditionBase, is_key_condition: bool, condition_cache_key: Hashable
+) -> ConditionExpressionComponents:
+    # Keyed on the structural key alone, so the cache never keeps conditions alive
+    cache_key = (condition_cache_key, is_key_condition)
+    with _CONDITION_EXPRESSION_COMPONENTS_CACHE_LOCK:
+        cached = _CONDITION_EXPRESSION_COMPONENTS_CACHE.get(cache_key)
+    if cached is None:
+        cached = _build_condition_expression_components(condition, is_key_condition)
+        with _CONDITION_EXPRESSION_COMPONENTS_CACHE_LOCK:
+            cache = _CONDITION_EXPRESSION_COMPONENTS_CACHE
+            if len(cache) >= _CONDITION_EXPRESSION_COMPONENTS_CACHE_MAXSIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                cache.pop(next(iter(cache)))
+            cache[cache_key] = cached
+    return cached
+
+
+def _parse_condition_expression_string(
+    condition_expression: str, is_key: bool
+) -> ConditionBaseExpression:
+    """Parse a condition string (e.g. "k1=s1"), building a new expression on every call"""
+    expression_format, operator, attr_class, attr_name, values = (
+        _parse_condition_expression_string__cached(condition_expression, is_key)
+    )
+    return ConditionBaseExpression(
+        format=expression_format,
+        operator=operator,
+        values=[
+            AttributeBaseExpression(attr_class, attr_name),
+            *(list(value) if isinstance(value, tuple) else value for value in values),
+        ],
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_condition_expression_string__cached(
+    condition_expression: str, is_key: bool
+) -> Tuple[str, str, str, Any, Tuple[Any, ...]]:
+    # Condition strings come from a small set of literals in practice, and parsing
+    # re-matches the string on every property access. Only immutable parts are cached
+    # (list values as tuples), so callers never share a mutable expression.
+    condition_string = ConditionBaseExpressionString(condition_expression)
+    expression = condition_string.get_condition_expression(is_key=is_key)
+    # The string grammar is a single attribute followed by its operand(s), if any
+    attribute, *values = expression.values
+    return (
+        expression.format,
+        expression.operator,
+        attribute.attr_class,
+        attribute.attr_name,
+        tuple(tuple(value) if isinstance(value, list) else value for value in values),
+    )
 
 
 class AttrPlaceholder(ValidatedStr):
@@ -236,11 +362,31 @@ class AttrPlaceholder(ValidatedStr):
         return map
 
 
+def _split_placeholder(placeholder: str) -> Tuple[str, str]:
+    """Split a placeholder (e.g. "#n10") into its prefix and number without building an
+    AttrPlaceholder.
+
+    Raises:
+        ValueError: If the placeholder is not a valid attribute placeholder.
+    """
+    match = AttrPlaceholder.regex_pattern.fullmatch(placeholder)
+    if match is None:
+        raise ValueError(f"Invalid attribute placeholder: {placeholder!r}")
+    return match.group(1), match.group(2)
+
+
 class ConditionBaseTranslator:
     _ATTRIBUTE_BASE_CLASS_LOOKUP = {_.__name__: _ for _ in get_all_subclasses(AttributeBase)}
     _CONDITION_BASE_CLASS_LOOKUP = {
         (_.expression_format, _.expression_operator): _ for _ in get_all_subclasses(ConditionBase)
     }
+    # Maps value types found in a condition's expression values to the name of the method that
+    # serializes them. Condition types take precedence, as some (e.g. `Size`) are also attributes.
+    # Literal types map to None and are passed through as is.
+    _SERIALIZE_VALUE_DISPATCH: Dict[type, Optional[str]] = {
+        **{_: "serialize_attribute" for _ in [AttributeBase, *get_all_subclasses(AttributeBase)]},
+        **{_: "serialize_condition" for _ in [ConditionBase, *get_all_subclasses(ConditionBase)]},
+    }
 
     @classmethod
     def deserialize_attribute(
@@ -279,8 +425,9 @@ class ConditionBaseTranslator:
             return condition_base_cls(*ce_values)
 
         if isinstance(condition_expression, str):
-            condition_string = ConditionBaseExpressionString(condition_expression)
-            condition_expression = condition_string.get_condition_expression(is_key=is_key)
+            condition_expression = _parse_condition_expression_string(
+                str(condition_expression), is_key
+            )
         return _deserialize_condition(condition_expression)
 
     @classmethod
@@ -293,16 +440,25 @@ class ConditionBaseTranslator:
         return ConditionBaseExpression(
             format=raw_expression["format"],
             operator=raw_expression["operator"],
-            values=[
-                cls.serialize_condition(value)
-                if isinstance(value, ConditionBase)
-                else (
-                    cls.serialize_attribute(value) if isinstance(value, (AttributeBase)) else value
-                )
-                for value in raw_expression["values"]
-            ],
+            values=[cls._serialize_value(value) for value in raw_expression["values"]],
         )
 
+    @classmethod
+    def _serialize_value(cls, value: Any) -> Any:
+        value_type = type(value)
+        try:
+            method_name = cls._SERIALIZE_VALUE_DISPATCH[value_type]
+        except KeyError:
+            # Type not seen yet (e.g. a literal): resolve once and remember it
+            if isinstance(value, ConditionBase):
+                method_name = "serialize_condition"
+            elif isinstance(value, AttributeBase):
+                method_name = "serialize_attribute"
+            else:
+                method_name = None
+            cls._SERIALIZE_VALUE_DISPATCH[value_type] = method_name
+        return value if method_name is None else getattr(cls, method_name)(value)
+
     @classmethod
     def _get_condition_base_operators(cls) -> List[str]:
         return [
@@ -1,6 +1,21 @@
-from copy import deepcopy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, Mapping, Optional, Union
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from aibs_informatics_core.utils.logging import get_logger
 from boto3.dynamodb.conditions import ConditionBase
@@ -13,20 +28,23 @@ from aibs_informatics_aws_utils.dynamodb.conditions import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_dynamodb import DynamoDBClient
     from mypy_boto3_dynamodb.type_defs import (
         BatchGetItemInputTypeDef,
         GetItemInputTypeDef,
         KeysAndAttributesTypeDef,
+        PutItemInputTypeDef,
         PutItemOutputTableTypeDef,
         QueryInputTableQueryTypeDef,
         QueryInputTypeDef,
         ScanInputTypeDef,
     )
 else:
+    DynamoDBClient = object
     BatchGetItemInputTypeDef = dict
-    GetItemInputRequestTypeDef = dict
     GetItemInputTypeDef = dict
     KeysAndAttributesTypeDef = dict
+    PutItemInputTypeDef = dict
     PutItemOutputTableTypeDef = dict
     QueryInputTableQueryTypeDef = dict
     QueryInputTypeDef = dict
@@ -40,6 +58,30 @@ get_dynamodb_client = AWSService.DYNAMO_DB.get_client
 get_dynamodb_resource = AWSService.DYNAMO_DB.get_resource
 
 
+_TYPE_SERIALIZER = TypeSerializer()
+_TYPE_DESERIALIZER = TypeDeserializer()
+
+
+def _serialize_item(item: Mapping[str, Any]) -> Dict[str, Any]:
+    return {k: _TYPE_SERIALIZER.serialize(v) for k, v in item.items()}
+
+
+def _deserialize_item(item: Mapping[str, Any]) -> Dict[str, Any]:
+    return {k: _TYPE_DESERIALIZER.deserialize(v) for k, v in item.items()}
+
+
+def _build_projection(attrs: Union[str, Sequence[str]]) -> Dict[str, Any]:
+    """Build ProjectionExpression (and ExpressionAttributeNames) request fields.
+
+    A string is used as the projection expression as is. A list of attribute names is
+    projected through `#a{i}` placeholders, so reserved words (e.g. "name") are allowed.
+    """
+    if isinstance(attrs, str):
+        return {"ProjectionExpression": attrs}
+    names = {f"#a{i}": attr for i, attr in enumerate(attrs)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
 # ----------------------------------------------------------------------------
 # Dynamo DB Table Methods
 # ----------------------------------------------------------------------------
@@ -60,71 +102,96 @@ def table_put_item(
     Returns:
         Response from the put_item operation.
     """
-    if condition_expression:
-        parsed_expression = ConditionExpressionComponents.from_condition(
-            condition_expression, False
-        )
-        kwargs["ConditionExpression"] = parsed_expression.condition_expression
-        kwargs["ExpressionAttributeNames"] = parsed_expression.expression_attribute_names
+    parsed_expression = (
+        ConditionExpressionComponents.from_condition(condition_expression, False)
+        if condition_expression
+        else None
+    )
+
+    if kwargs:
+        # Additional kwargs follow the Table resource API (e.g. a ConditionBase as
+        # ConditionExpression, Expected, or unserialized ExpressionAttributeValues),
+        # so let the resource translate them.
+        if parsed_expression:
+            kwargs["ConditionExpression"] = parsed_expression.condition_expression
+            kwargs["ExpressionAttributeNames"] = parsed_expression.expression_attribute_names
+            # Not always necessary to have ExpressionAttributeValues
+            if parsed_expression.expression_attribute_values:
+                kwargs["ExpressionAttributeValues"] = parsed_expression.expression_attribute_values
+
+        # For more details on additional kwargs for table.put_item see:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/dynamodb.html#DynamoDB.Table.put_item
+        table = table_as_resource(table_name)
+        return table.put_item(Item=item, **kwargs)
+
+    props: PutItemInputTypeDef = {"TableName": table_name, "Item": _serialize_item(item)}
+    if parsed_expression:
+        props["ConditionExpression"] = parsed_expression.condition_expression
+        props["ExpressionAttributeNames"] = parsed_expression.expression_attribute_names
         # Not always necessary to have ExpressionAttributeValues
         if parsed_expression.expression_attribute_values:
-            kwargs["ExpressionAttributeValues"] = parsed_expression.expression_attribute_values
+            props["ExpressionAttributeValues"] = (
+                parsed_expression.expression_attribute_values__serialized
+            )
 
-    # For more details on additional kwargs for table.put_item see:
-    # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/dynamodb.html#DynamoDB.Table.put_item
-    table = table_as_resource(table_name)
-    return table.put_item(Item=item, **kwargs)
+    db = get_dynamodb_client()
+    return db.put_item(**props)  # type: ignore  # same shape as the Table.put_item output
 
 
 def table_get_item(
-    table_name: str, key: Mapping[str, Any], attrs: Optional[str] = None
+    table_name: str, key: Mapping[str, Any], attrs: Optional[Union[str, Sequence[str]]] = None
 ) -> Optional[Dict[str, Any]]:
     """Get a single item from a DynamoDB table.
 
     Args:
         table_name: Name of the table.
         key: Dictionary of key attribute(s) identifying the item to get.
-        attrs: Optional projection expression specifying which attributes to retrieve.
+        attrs: Optional projection expression, or list of attribute names, specifying
+            which attributes to retrieve.
 
     Returns:
         The item if found, None otherwise.
     """
-    table = table_as_resource(table_name)
-    props: GetItemInputRequestTypeDef = {"Key": key, "ReturnConsumedCapacity": "NONE"}  # type: ignore  # we modify use of this type (no table name is needed here)
+    db = get_dynamodb_client()
+    props: GetItemInputTypeDef = {
+        "TableName": table_name,
+        "Key": _serialize_item(key),
+        "ReturnConsumedCapacity": "NONE",
+    }
 
     if attrs is not None:
-        props["ProjectionExpression"] = attrs
+        props.update(_build_projection(attrs))  # type: ignore
 
-    response = table.get_item(**props)  # type: ignore  # pylance complains about extra fields
+    response = db.get_item(**props)
 
-    logger.info("Response from table.get_item: %s", response)
+    logger.info("Response from client.get_item: %s", response)
 
-    return response.get("Item", None)
+    item = response.get("Item", None)
+    return _deserialize_item(item) if item is not None else None
 
 
 def table_get_items(
     table_name: str,
     keys: List[Mapping[str, Any]],
-    attrs: Optional[str] = None,
+    attrs: Optional[Union[str, Sequence[str]]] = None,
     region: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """Batch get multiple items from a DynamoDB table.
 
-    Handles pagination automatically when more than 100 keys are provided.
+    Handles pagination automatically when more than 100 keys are provided; the
+    resulting 100 key requests are issued concurrently.
 
     Args:
         table_name: Name of the table.
         keys: List of key dictionaries identifying the items to get.
-        attrs: Optional projection expression specifying which attributes to retrieve.
+        attrs: Optional projection expression, or list of attribute names, specifying
+            which attributes to retrieve.
         region: AWS region. Defaults to None (uses default region).
 
     Returns:
         List of items found.
     """
     db = get_dynamodb_client(region=region)
-    serializer = TypeSerializer()
-
-    items: List[Dict[str, Any]] = []
 
     # we receive an error if there are more than 100 calls
     # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/dynamodb.html#DynamoDB.Client.batch_get_item
@@ -133,11 +200,9 @@ def table_get_items(
     keys_subset_list = [
         keys[i : i + MAX_KEYS_PER_API_CALL] for i in range(0, len(keys), MAX_KEYS_PER_API_CALL)
     ]
+    props_list: List[BatchGetItemInputTypeDef] = []
     for keys_subset in keys_subset_list:
-        serialized_keys = [
-            {key: serializer.serialize(value) for key, value in attr_value.items()}
-            for attr_value in keys_subset
-        ]
+        serialized_keys = [_serialize_item(attr_value) for attr_value in keys_subset]
 
         request_items: Mapping[str, KeysAndAttributesTypeDef] = {
             table_name: {
@@ -151,22 +216,51 @@ def table_get_items(
 
         if attrs is not None:
             for _, keys_and_attrs in request_items.items():
-                keys_and_attrs["ProjectionExpression"] = attrs
-
-        while True:
-            response = db.batch_get_item(**props)
-            for table_items in response["Responses"].values():
-                items.extend(table_items)
-            # Must make subsequent calls for Unprocessed keys if present.
-            # https://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_BatchGetItem.html#DDB-BatchGetItem-response-UnprocessedKeys
-            if response.get("UnprocessedKeys", None):
-                props["RequestItems"] = response["UnprocessedKeys"]
-            else:
-                # If no more keys to process, break from while loop.
-                break
+                keys_and_attrs.update(_build_projection(attrs))  # type: ignore
+        props_list.append(props)
+
+    items: List[Dict[str, Any]] = []
+    if len(props_list) <= 1:
+        for props in props_list:
+            items.extend(_batch_get_items(db, props))
+    else:
+        # Chunks are independent, so fetch them concurrently. Worker count stays within
+        # botocore's default connection pool size (10) of the shared client.
+        with ThreadPoolExecutor(max_workers=min(len(props_list), 10)) as executor:
+            for chunk_items in executor.map(partial(_batch_get_items, db), props_list):
+                items.extend(chunk_items)
+
+    return [_deserialize_item(item) for item in items]
+
+
+def _batch_get_items(db: DynamoDBClient, props: BatchGetItemInputTypeDef) -> List[Dict[str, Any]]:
+    """Run a BatchGetItem request until no unprocessed keys remain.
+
+    Unprocessed keys are retried with exponential backoff (capped at ~2 seconds).
+
+    Args:
+        db: DynamoDB client.
+        props: BatchGetItem request (at most 100 keys).
 
-    deserializer = TypeDeserializer()
-    return [{k: deserializer.deserialize(v) for k, v in item.items()} for item in items]
+    Returns:
+        List of serialized items returned.
+    """
+    items: List[Dict[str, Any]] = []
+    attempt = 0
+    while True:
+        response = db.batch_get_item(**props)
+        for table_items in response["Responses"].values():
+            items.extend(table_items)
+        # Must make subsequent calls for Unprocessed keys if present.
+        # https://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_BatchGetItem.html#DDB-BatchGetItem-response-UnprocessedKeys
+        if response.get("UnprocessedKeys", None):
+            props["RequestItems"] = response["UnprocessedKeys"]
+            time.sleep(min(0.05 * 2**attempt, 2.0))
+            attempt += 1
+        else:
+            # If no more keys to process, break from while loop.
+            break
+    return items
 
 
 def table_update_item(
@@ -278,7 +372,6 @@ def table_query(
         List of items matching the query.
     """
     db = get_dynamodb_client(region=region)
-    table = table_as_resource(table_name)
 
     key_expr_component = ConditionExpressionComponents.from_condition(
         key_condition_expression, True
@@ -289,7 +382,7 @@ def table_query(
     )
 
     db_request: QueryInputTypeDef = {
-        "TableName": table.name,
+        "TableName": table_name,
         "KeyConditionExpression": key_expr_component.condition_expression,
     }
 
@@ -326,15 +419,14 @@ def table_query(
 
     items: List[Dict[str, Any]] = []
     paginator = db.get_paginator("query")
-    logger.info(f"Performing DB 'query' on {table.name} with following parameters: {db_request}")
+    logger.info(f"Performing DB 'query' on {table_name} with following parameters: {db_request}")
     for i, response in enumerate(paginator.paginate(**db_request)):  # type: ignore  # pylance complains about extra fields
         new_items = response.get("Items", [])
         items.extend(new_items)
         logger.debug(f"Iter #{i + 1}: item count from table. Query: {len(new_items)}")
     logger.info(f"Complete item count from table. Query (after any filtering): {len(items)}")
 
-    deserializer = TypeDeserializer()
-    return [{k: deserializer.deserialize(v) for k, v in item.items()} for item in items]
+    return [_deserialize_item(item) for item in items]
 
 
 def table_scan(
@@ -362,9 +454,8 @@ def table_scan(
     """
 
     db = get_dynamodb_client(region=region)
-    table = table_as_resource(table_name)
 
-    db_request: ScanInputTypeDef = {"TableName": table.name}
+    db_request: ScanInputTypeDef = {"TableName": table_name}
 
     # Handle when filter_expression is provided
     if filter_expression is not None:
@@ -395,7 +486,7 @@ def table_scan(
 
     items: List[Dict[str, Any]] = []
     paginator = db.get_paginator("scan")
-    logger.info(f"Performing DB 'scan' on {table.name} with following parameters: {db_request}")
+    logger.info(f"Performing DB 'scan' on {table_name} with following parameters: {db_request}")
     for i, response in enumerate(paginator.paginate(**db_request)):  # type: ignore  # pylance complains about extra fields
         new_items = response.get("Items", [])
         items.extend(new_items)
@@ -404,8 +495,7 @@ def table_scan(
         f"Complete item count from table. Scan results (after any filtering): {len(items)}"
     )
 
-    deserializer = TypeDeserializer()
-    return [{k: deserializer.deserialize(v) for k, v in item.items()} for item in items]
+    return [_deserialize_item(item) for item in items]
 
 
 def table_get_key_schema(table_name: str) -> Dict[str, str]:
@@ -461,6 +551,67 @@ def table_as_resource(table: str, region: Optional[str] = None):
     return db.Table(table)
 
 
+# Immutable leaf types that may appear in DynamoDB items
+_SCALAR_TYPES = frozenset((str, int, bool, bytes, type(None), Decimal, float))
+
+
+def _has_nothing_to_convert(item: Dict[str, Any], convert_type: type) -> bool:
+    """Whether item is flat (only immutable scalars) and holds no values of convert_type"""
+    return all(type(v) in _SCALAR_TYPES and type(v) is not convert_type for v in item.values())
+
+
+def _float_to_decimal(value: float) -> Decimal:
+    return Decimal(str(value))
+
+
+def _empty_copy(container: Union[Dict[Any, Any], List[Any]]) -> Any:
+    """Empty container of the same type, keeping subclass state (e.g. a default_factory)"""
+    if type(container) is dict:
+        return {}
+    if type(container) is list:
+        return []
+    clone = copy(container)
+    clone.clear()
+    return clone
+
+
+def _convert_values(
+    item: Dict[str, Any],
+    convert_type: type,
+    converter: Callable[[Any], Any],
+    in_place: bool,
+) -> Dict[str, Any]:
+    """Apply converter to all values of convert_type nested in dicts/lists of the item.
+
+    Nested containers are walked with an explicit stack rather than recursion. When not
+    in place, the dict/list structure (including subclasses such as OrderedDict) is cloned
+    in the same pass; other mutable values (e.g. sets) are deep copied.
+    """
+    root: Dict[str, Any] = item if in_place else _empty_copy(item)
+    stack: List[Tuple[Any, Any]] = [(item, root)]
+    while stack:
+        src, dst = stack.pop()
+        is_list = isinstance(src, list)
+        for k, v in enumerate(src) if is_list else src.items():
+            if isinstance(v, convert_type):
+                v = converter(v)
+            elif isinstance(v, (dict, list)):
+                child = v if in_place else _empty_copy(v)
+                stack.append((v, child))
+                if in_place:
+                    continue
+                v = child
+            elif in_place:
+                continue
+            elif type(v) not in _SCALAR_TYPES:
+                v = deepcopy(v)
+            if is_list and not in_place:
+                dst.append(v)
+            else:
+                dst[k] = v
+    return root
+
+
 def convert_decimals_to_floats(item: Dict[str, Any], in_place: bool = True) -> Dict[str, Any]:
     """Convert all Decimal values in a dictionary to floats.
 
@@ -475,25 +626,10 @@ def convert_decimals_to_floats(item: Dict[str, Any], in_place: bool = True) -> D
     Returns:
         The dictionary with all Decimals converted to floats.
     """
-
-    def _convert_decimals_to_floats(obj: Union[Dict[str, Any], List[Any]]):
-        if isinstance(obj, list):
-            for i in range(len(obj)):
-                if isinstance(obj[i], Decimal):
-                    obj[i] = float(obj[i])
-                elif isinstance(obj[i], (dict, list)):
-                    _convert_decimals_to_floats(obj[i])
-        elif isinstance(obj, dict):
-            for k in obj:
-                if isinstance(obj[k], Decimal):
-                    obj[k] = float(obj[k])
-                elif isinstance(obj[k], (dict, list)):
-                    _convert_decimals_to_floats(obj[k])
-
-    if not in_place:
-        item = deepcopy(item)
-    _convert_decimals_to_floats(item)
-    return item
+    # Fast path for flat items without Decimals (e.g. keys); a shallow copy suffices here
+    if _has_nothing_to_convert(item, Decimal):
+        return item if in_place else copy(item)
+    return _convert_values(item, Decimal, float, in_place=in_place)
 
 
 def convert_floats_to_decimals(item: Dict[str, Any], in_place: bool = True) -> Dict[str, Any]:
@@ -510,22 +646,7 @@ def convert_floats_to_decimals(item: Dict[str, Any], in_place: bool = True) -> D
     Returns:
         The dictionary with all floats converted to Decimals.
     """
-
-    def _convert_floats_to_decimals(obj: Union[Dict[str, Any], List[Any]]):
-        if isinstance(obj, list):
-            for i in range(len(obj)):
-                if isinstance(obj[i], float):
-                    obj[i] = Decimal(str(obj[i]))
-                elif isinstance(obj[i], (dict, list)):
-                    _convert_floats_to_decimals(obj[i])
-        elif isinstance(obj, dict):
-            for k in obj:
-                if isinstance(obj[k], float):
-                    obj[k] = Decimal(str(obj[k]))
-                elif isinstance(obj[k], (dict, list)):
-                    _convert_floats_to_decimals(obj[k])
-
-    if not in_place:
-        item = deepcopy(item)
-    _convert_floats_to_decimals(item)
-    return item
+    # Fast path for flat items without floats (e.g. keys); a shallow copy suffices here
+    if _has_nothing_to_convert(item, float):
+        return item if in_place else copy(item)
+    return _convert_values(item, float, _float_to_decimal, in_place=in_place)
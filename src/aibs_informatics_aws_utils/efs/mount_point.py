@@ -43,6 +43,8 @@ logger = logging.getLogger(__name__)
 
 StrPath = Union[Path, str]
 
+MOUNT_POINT_NAME_PATTERN = re.compile(r"[a-zA-Z][\w]{0,11}")
+
 
 get_lambda_client = AWSService.LAMBDA.get_client
 get_batch_client = AWSService.BATCH.get_client
@@ -369,7 +371,7 @@ class MountPointConfiguration:
         else:
             mount_point_id = mount_point_id.normalized
 
-        if name and not re.match(r"[a-zA-Z][\w]{0,11}", name):
+        if name and not MOUNT_POINT_NAME_PATTERN.match(name):
             raise ValueError(
                 f"Invalid mount point name {name}. Must be a valid environment variable name."
             )
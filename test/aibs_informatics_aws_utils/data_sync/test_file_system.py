@@ -1,15 +1,19 @@
 import errno
-from dataclasses import dataclass
-from datetime import datetime
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Mapping, Optional, Set, Tuple, Union
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Union
 from unittest import mock
 
-import pytz
 from aibs_informatics_core.models.aws.efs import EFSPath
 from aibs_informatics_core.models.aws.s3 import S3URI, S3PathStats
 from aibs_informatics_core.utils.time import get_current_time
 from aibs_informatics_core.utils.tools.strtools import removeprefix
+from pytest import mark, param
 
 from aibs_informatics_aws_utils.data_sync.file_system import (
     EFSFileSystem,
@@ -23,11 +27,56 @@ from test.aibs_informatics_aws_utils.base import AwsBaseTest
 from test.aibs_informatics_aws_utils.efs.base import EFSTestsBase
 from test.base import BaseTest
 
+# Memory-backed file system (Linux), used for file system test temp dirs when available
+TMPFS_ROOT = "/dev/shm"
+TMPFS_MIN_FREE_BYTES = 64 * 1024 * 1024
+
+
+class TmpfsTmpPathMixin:
+    """Creates `tmp_path()` dirs under TMPFS_ROOT, falling back to the default temp dir."""
+
+    def tmp_path(self) -> Path:
+        if not self._tmpfs_is_usable():
+            return super().tmp_path()  # type: ignore[misc]
+        path = Path(tempfile.mkdtemp(dir=TMPFS_ROOT))
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)  # type: ignore[attr-defined]
+        return path
+
+    @staticmethod
+    def _tmpfs_is_usable() -> bool:
+        if not os.path.isdir(TMPFS_ROOT) or not os.access(TMPFS_ROOT, os.W_OK):
+            return False
+        # /dev/shm can be tiny (e.g. 64MB by default in docker containers)
+        return shutil.disk_usage(TMPFS_ROOT).free >= TMPFS_MIN_FREE_BYTES
+
 
 def any_s3_uri(bucket: str = "bucket", key: str = "key") -> S3URI:
     return S3URI.build(bucket, key)
 
 
+def write_files(
+    root: Path,
+    file_stats_map: Mapping[Union[Path, str], Tuple[int]],
+    create_content: bool = True,
+):
+    # Group files by parent so each directory is created only once
+    parent_to_files: Dict[Path, List[Tuple[Path, int]]] = {}
+    for relative_path, (size,) in file_stats_map.items():
+        full_path = root / relative_path
+        parent_to_files.setdefault(full_path.parent, []).append((full_path, size))
+
+    for parent, files in parent_to_files.items():
+        parent.mkdir(parents=True, exist_ok=True)
+        for full_path, size in files:
+            fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+            try:
+                # Files are left empty when their content (and size) is never inspected
+                if create_content:
+                    os.write(fd, b"0" * size)
+            finally:
+                os.close(fd)
+
+
 class NodeTests(BaseTest):
     def test__depth__provides_expected(self):
         n = Node("/path/to/my/root")
@@ -50,6 +99,24 @@ class NodeTests(BaseTest):
         n.add_object("d1/x", 1, get_current_time())
         self.assertEqual(n.path_stats.size_bytes, 1)
 
+    def test__path_stats__refreshed_after_add_object(self):
+        n = Node("/root")
+        n.add_object("d1/x", 1, get_current_time())
+        self.assertEqual(n.path_stats.size_bytes, 1)
+        self.assertEqual(n["d1"].path_stats.object_count, 1)
+
+        n.add_object("d1/y", 2, get_current_time())
+        self.assertEqual(n.path_stats.size_bytes, 3)
+        self.assertEqual(n["d1"].path_stats.object_count, 2)
+
+    def test__last_modified__shared_with_ancestors(self):
+        n = Node("/root")
+        last_modified = get_current_time()
+        n.add_object("d1/x", 1, last_modified)
+        assert n.last_modified is last_modified
+        assert n["d1"].last_modified is last_modified
+        assert n["d1/x"].last_modified is last_modified
+
     def test__repr__works(self):
         n = Node("/root")
         assert isinstance(str(n), str)
@@ -88,21 +155,60 @@ class NodeTests(BaseTest):
         ]
         self.assertListEqual(actual_paths, expected_paths)
 
+    def test__add_objects__matches_add_object(self):
+        last_modified = get_current_time()
+        objects = [
+            ("a/b/x", 1, last_modified),
+            ("a/b/y", 2, datetime(2020, 1, 1, tzinfo=timezone.utc)),
+            ("/c", 3, last_modified),
+            ("a/d/", 4, last_modified),
+            ("a//e", 5, last_modified),
+            ("a/b/x", 6, last_modified),
+        ]
+        expected = Node("/root")
+        for path, size, obj_last_modified in objects:
+            expected.add_object(path, size, obj_last_modified)
+
+        actual = Node("/root")
+        actual.add_objects(objects)
+
+        def node_stats(node: Node):
+            return [
+                (_.path, _.size_bytes, _.object_count, _.last_modified) for _ in node.list_nodes()
+            ]
+
+        self.assertListEqual(node_stats(actual), node_stats(expected))
+
+    def test__list_nodes__depth_first_order(self):
+        n = Node("/root")
+        n.add_object("a/b/x", 1, get_current_time())
+        n.add_object("c", 1, get_current_time())
+
+        actual_paths = [node.path for node in n.list_nodes()]
+        self.assertListEqual(
+            actual_paths, ["/root/", "/root/a/", "/root/a/b/", "/root/a/b/x", "/root/c"]
+        )
+
+
+@dataclass
+class FakePath:
+    """Minimal stand-in for Path that raises the given errors from successive stat() calls"""
+
+    stat_errors: List[Optional[OSError]]
+    exists_results: List[bool] = field(default_factory=list)
+
+    def stat(self):
+        if (error := self.stat_errors.pop(0)) is not None:
+            raise error
+
+    def exists(self) -> bool:
+        return self.exists_results.pop(0)
 
-class LocalFileSystemTests(BaseTest):
+
+class LocalFileSystemTests(TmpfsTmpPathMixin, BaseTest):
     def setUp(self) -> None:
         super().setUp()
 
-    def create_local_file_system(
-        self, file_stats_map: Mapping[Union[Path, str], Tuple[int]]
-    ) -> Path:
-        root_file_system = self.tmp_path()
-        for relative_path, (size,) in file_stats_map.items():
-            full_path = root_file_system / relative_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text("0" * size)
-        return root_file_system
-
     @mock.patch("aibs_informatics_aws_utils.data_sync.file_system.find_all_paths")
     @mock.patch("aibs_informatics_aws_utils.data_sync.file_system.Path")
     def test__refresh__handles_errors(self, mock_Path, mock_find_all_paths):
@@ -111,171 +217,28 @@ class LocalFileSystemTests(BaseTest):
         b = root / "b"
 
         mock_find_all_paths.return_value = [str(a), str(b)]
-        p1 = mock.MagicMock()
-        p1.stat.side_effect = FileNotFoundError()
-        p2 = mock.MagicMock()
-        ose = OSError()
-        ose.errno = errno.ESTALE
-        p2.stat.side_effect = ose
-
-        p2.exists.side_effect = [True, False]
+        p1 = FakePath(stat_errors=[FileNotFoundError()])
+        p2 = FakePath(
+            stat_errors=[OSError(errno.ESTALE, "stale"), OSError(errno.ESTALE, "stale")],
+            exists_results=[True, False],
+        )
         mock_Path.side_effect = [p1, p2, p2, p2, p2]
         (_ := LocalFileSystem(root)).refresh()
 
         with self.assertRaises(OSError):
-            ose.errno = errno.ETIME
-            p1.stat.side_effect = ose
+            p3 = FakePath(stat_errors=[OSError(errno.ETIME, "timer expired")])
             mock_find_all_paths.return_value = ["a"]
-            mock_Path.side_effect = [p1]
+            mock_Path.side_effect = [p3]
             LocalFileSystem(root).refresh()
 
-    def test__partition__partitions_by_size__partitions_to_object_level(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (5,),
-                "A/A/Y": (5,),
-                "A/B/X": (5,),
-                "A/B/Y": (5,),
-            },
-            size_bytes_limit=6,
-            expected_node_paths={
-                "A/A/X",
-                "A/A/Y",
-                "A/B/X",
-                "A/B/Y",
-            },
-        )
-
-    def test__partition__partitions_by_size__eats_error_obj_too_large(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/X": (5,),
-                "A/B/X": (2,),
-                "A/B/Y": (2,),
-            },
-            size_bytes_limit=4,
-            expected_node_paths={
-                "A/X",
-                "A/B/",
-            },
-        )
-
-    def test__partition__partitions_by_size__partitions_at_top_level(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (1,),
-                "A/A/Y": (1,),
-                "A/B/X": (1,),
-                "A/B/Y": (1,),
-            },
-            size_bytes_limit=2,
-            expected_node_paths={
-                "A/A/",
-                "A/B/",
-            },
-        )
-
-    def test__partition__partitions_by_size__partitions_at_varying_levels(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (1,),
-                "A/A/Y": (1,),
-                "A/B/X": (3,),
-                "A/B/Y": (2,),
-            },
-            size_bytes_limit=4,
-            expected_node_paths={
-                "A/A/",
-                "A/B/X",
-                "A/B/Y",
-            },
-        )
-
-    def test__partition__partitions_by_size__partitions_at_varying_levels_case_2(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (1,),
-                "A/A/Y": (1,),
-                "A/B/A/X": (2,),
-                "A/B/A/Y": (2,),
-                "A/B/Y": (5,),
-            },
-            size_bytes_limit=5,
-            expected_node_paths={
-                "A/A/",
-                "A/B/A/",
-                "A/B/Y",
-            },
-        )
-
-    def test__partition__partitions_by_count__partitions_at_varying_levels(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (1,),
-                "A/A/Y": (1,),
-                "A/B/A/X": (2,),
-                "A/B/A/Y": (2,),
-                "A/B/Y": (5,),
-            },
-            object_count_limit=2,
-            expected_node_paths={
-                "A/A/",
-                "A/B/A/",
-                "A/B/Y",
-            },
-        )
-
-    def test__partition__partitions_by_size_and_count__partitions_at_varying_levels(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (5,),
-                "A/A/Y": (1,),
-                "A/B/A/X": (2,),
-                "A/B/A/Y": (2,),
-                "A/B/Y": (1,),
-            },
-            size_bytes_limit=5,
-            object_count_limit=2,
-            expected_node_paths={
-                "A/A/X",
-                "A/A/Y",
-                "A/B/A/",
-                "A/B/Y",
-            },
-        )
-
-    def test__partition__partitions_by_size__no_partitioning_required(self):
-        self.assertLocalFileSystem_partition(
-            file_stats_map={
-                "A/A/X": (1,),
-                "A/A/Y": (1,),
-                "A/B/X": (3,),
-                "A/B/Y": (2,),
-                "B/B/Y": (2,),
-            },
-            size_bytes_limit=10,
-            object_count_limit=10,
-            expected_node_paths={""},
-        )
-
-    def assertLocalFileSystem_partition(
-        self,
-        file_stats_map: Mapping[Union[Path, str], Tuple[int]],
-        expected_node_paths: Set[str],
-        size_bytes_limit: Optional[int] = None,
-        object_count_limit: Optional[int] = None,
-    ):
-        local_path = self.create_local_file_system(file_stats_map=file_stats_map)
-        local_root = LocalFileSystem.from_path(str(local_path))
-        local_nodes = local_root.partition(
-            size_bytes_limit=size_bytes_limit, object_count_limit=object_count_limit
-        )
-        local_node_paths = {removeprefix(node.path, f"{local_path}/") for node in local_nodes}
+    def test__tmp_path__falls_back_when_tmpfs_is_too_small(self):
+        with mock.patch.object(shutil, "disk_usage", return_value=mock.Mock(free=0)):
+            path = self.tmp_path()
+        self.assertFalse(str(path).startswith(TMPFS_ROOT))
+        self.assertTrue(path.is_dir())
 
-        self.assertSetEqual(expected_node_paths, local_node_paths)
 
-
-class EFSFileSystemTests(EFSTestsBase):
+class EFSFileSystemTests(TmpfsTmpPathMixin, EFSTestsBase):
     def setUp(self) -> None:
         super().setUp()
         detect_mount_points.cache_clear()
@@ -302,14 +265,14 @@ class EFSFileSystemTests(EFSTestsBase):
 
     def test__from_path__resolves_efs_path(self):
         mount_point_path, efs_path = self.setUpEFSFileSystem("ap", access_point_path="/A/B")
-        self.populate_file_system(mount_point_path, {"X": (1,)})
+        self.populate_file_system(mount_point_path, {"X": (1,)}, create_content=False)
         efs_root = EFSFileSystem.from_path(str(efs_path))
         assert efs_root.path == mount_point_path
         assert efs_root.efs_path == efs_path
 
     def test__from_path__resolves_local_path(self):
         mount_point_path, efs_path = self.setUpEFSFileSystem("ap", access_point_path="/A/B")
-        self.populate_file_system(mount_point_path, {"X": (1,)})
+        self.populate_file_system(mount_point_path, {"X": (1,)}, create_content=False)
         efs_root = EFSFileSystem.from_path(str(mount_point_path))
         assert efs_root.path == mount_point_path
         assert efs_root.efs_path == efs_path
@@ -325,22 +288,12 @@ class EFSFileSystemTests(EFSTestsBase):
         assert efs_node_paths == {f"{efs_path}/X", f"{efs_path}/Y"}
 
     def populate_file_system(
-        self, path: Path, file_stats_map: Mapping[Union[Path, str], Tuple[int]]
+        self,
+        path: Path,
+        file_stats_map: Mapping[Union[Path, str], Tuple[int]],
+        create_content: bool = True,
     ):
-        for relative_path, (size,) in file_stats_map.items():
-            full_path = path / relative_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text("0" * size)
-
-
-# HACK: this is recreating the ObjectSummary class that does not explicitly
-#       exist in boto package.
-@dataclass
-class ObjectSummary:
-    last_modified: datetime
-    size: int
-    bucket_name: str
-    key: str
+        write_files(path, file_stats_map, create_content=create_content)
 
 
 class S3FileSystemTests(AwsBaseTest):
@@ -350,29 +303,41 @@ class S3FileSystemTests(AwsBaseTest):
         self.KEY_PREFIX = "my-fav/prefix/"
         self.KEY_PREFIX_NO_SEP = "my-fav/prefix"
 
-        self.mock_s3_resource = mock.MagicMock()
-        self.mock_get_s3_resource = self.create_patch(
-            "aibs_informatics_aws_utils.data_sync.file_system.get_s3_resource"
+        self.mock_s3_client = mock.MagicMock()
+        self.mock_get_s3_client = self.create_patch(
+            "aibs_informatics_aws_utils.data_sync.file_system.get_s3_client"
         )
-        self.mock_get_s3_resource.return_value = self.mock_s3_resource
+        self.mock_get_s3_client.return_value = self.mock_s3_client
 
     def mock_bucket(self, s3_paths_stats: Mapping[S3URI, S3PathStats]):
-        mock_bucket = mock.MagicMock()
-        mock_bucket.objects = mock.MagicMock()
-
-        def object_filter(Prefix: str = None):
-            return [
-                ObjectSummary(
-                    last_modified=s3_path_stats.last_modified,
-                    size=s3_path_stats.size_bytes,
-                    bucket_name=s3_path.bucket,
-                    key=s3_path.key,
+        mock_paginator = mock.MagicMock()
+
+        def paginate(Bucket: str, Prefix: str, Delimiter: Optional[str] = None):
+            contents = []
+            common_prefixes = set()
+            for s3_path, s3_path_stats in s3_paths_stats.items():
+                if not s3_path.key.startswith(Prefix):
+                    continue
+                relative_key = s3_path.key[len(Prefix) :]
+                if Delimiter and Delimiter in relative_key:
+                    common_prefixes.add(Prefix + relative_key.split(Delimiter, 1)[0] + Delimiter)
+                    continue
+                contents.append(
+                    {
+                        "Key": s3_path.key,
+                        "Size": s3_path_stats.size_bytes,
+                        "LastModified": s3_path_stats.last_modified,
+                    }
                 )
-                for s3_path, s3_path_stats in s3_paths_stats.items()
+            return [
+                {
+                    "Contents": contents,
+                    "CommonPrefixes": [{"Prefix": _} for _ in sorted(common_prefixes)],
+                }
             ]
 
-        mock_bucket.objects.filter.side_effect = object_filter
-        self.mock_s3_resource.Bucket.return_value = mock_bucket
+        mock_paginator.paginate.side_effect = paginate
+        self.mock_s3_client.get_paginator.return_value = mock_paginator
 
     def get_s3_path_and_stats(
         self,
@@ -388,225 +353,233 @@ class S3FileSystemTests(AwsBaseTest):
                 key=f"{key_prefix or self.KEY_PREFIX}{key_suffix}",
             ),
             S3PathStats(
-                last_modified=last_modified or datetime.now(tz=pytz.UTC),
+                last_modified=last_modified or datetime.now(tz=timezone.utc),
                 size_bytes=size,
                 object_count=1,
             ),
         )
 
-    def test__partition__partitions_by_size__partitions_single_object(self):
+    def test__refresh__lists_tree_in_single_flat_listing(self):
         s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "": S3PathStats(last_modified, 5, 1),
-            },
-            size_bytes_limit=6,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}",
-            },
+        self.mock_bucket(
+            s3_paths_stats=dict(
+                [self.get_s3_path_and_stats(key_suffix=key) for key in ["X", "A/B/C/X"]]
+            )
         )
 
-    def test__partition__partitions_by_size__partitions_to_object_level(self):
-        s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 5, 1),
-                "A/A/Y": S3PathStats(get_current_time(), 5, 1),
-                "A/B/X": S3PathStats(last_modified, 5, 1),
-                "A/B/Y": S3PathStats(last_modified, 5, 1),
-            },
-            size_bytes_limit=6,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/A/X",
-                f"{self.KEY_PREFIX}A/A/Y",
-                f"{self.KEY_PREFIX}A/B/X",
-                f"{self.KEY_PREFIX}A/B/Y",
-            },
-        )
+        s3_root = S3FileSystem.from_path(s3_root_uri)
 
-    # def test__partition__partitions_by_size__partitions_to_object_level__key_no_sep(self):
-    #     s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX_NO_SEP)
-    #     last_modified = get_current_time()
-    #     self.assertS3Root_partition(
-    #         s3_root_uri=s3_root_uri,
-    #         key_stats_map={
-    #             "/A/A/X": S3PathStats(last_modified, 5, 1),
-    #             "A/A/Y": S3PathStats(get_current_time(), 5, 1),
-    #             "A/B/X": S3PathStats(last_modified, 5, 1),
-    #             "A/B/Y": S3PathStats(last_modified, 5, 1),
-    #         },
-    #         size_bytes_limit=6,
-    #         expected_s3_node_keys={
-    #             f"{self.KEY_PREFIX_NO_SEP}/A/A/X",
-    #             f"{self.KEY_PREFIX_NO_SEP}A/A/Y",
-    #             f"{self.KEY_PREFIX_NO_SEP}A/B/X",
-    #             f"{self.KEY_PREFIX_NO_SEP}A/B/Y",
-    #         },
-    #     )
-
-    def test__partition__partitions_by_size__eats_error_obj_too_large(self):
-        s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/X": S3PathStats(last_modified, 5, 1),
-                "A/B/X": S3PathStats(last_modified, 2, 1),
-                "A/B/Y": S3PathStats(last_modified, 2, 1),
-            },
-            size_bytes_limit=4,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/X",
-                f"{self.KEY_PREFIX}A/B/",
-            },
+        mock_paginator = self.mock_s3_client.get_paginator.return_value
+        mock_paginator.paginate.assert_called_once_with(
+            Bucket=self.BUCKET_NAME, Prefix=self.KEY_PREFIX
         )
+        self.assertEqual(s3_root.node.object_count, 2)
 
-    def test__partition__partitions_by_size__partitions_at_top_level(self):
+    def test__refresh__adds_listing_one_page_at_a_time(self):
         s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 1, 1),
-                "A/A/Y": S3PathStats(last_modified, 1, 1),
-                "A/B/X": S3PathStats(last_modified, 1, 1),
-                "A/B/Y": S3PathStats(last_modified, 1, 1),
-            },
-            size_bytes_limit=2,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/A/",
-                f"{self.KEY_PREFIX}A/B/",
-            },
-        )
+        pages = [
+            {"Contents": [{"Key": self.KEY_PREFIX + key, "Size": size, "LastModified": now}]}
+            for key, size, now in [
+                ("A/X", 1, datetime.now(tz=timezone.utc)),
+                ("A/B/X", 2, datetime.now(tz=timezone.utc)),
+                ("C/X", 3, datetime.now(tz=timezone.utc)),
+            ]
+        ]
+        mock_paginator = self.mock_s3_client.get_paginator.return_value
+        mock_paginator.paginate.return_value = iter(pages)
 
-    def test__partition__partitions_by_size__partitions_at_varying_levels(self):
-        s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 1, 1),
-                "A/A/Y": S3PathStats(last_modified, 1, 1),
-                "A/B/X": S3PathStats(last_modified, 3, 1),
-                "A/B/Y": S3PathStats(last_modified, 2, 1),
-            },
-            size_bytes_limit=4,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/A/",
-                f"{self.KEY_PREFIX}A/B/X",
-                f"{self.KEY_PREFIX}A/B/Y",
-            },
-        )
+        with mock.patch.object(
+            Node, "add_objects", autospec=True, side_effect=Node.add_objects
+        ) as mock_add_objects:
+            s3_root = S3FileSystem.from_path(s3_root_uri)
 
-    def test__partition__partitions_by_size__partitions_at_varying_levels_case_2(self):
-        s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 1, 1),
-                "A/A/Y": S3PathStats(last_modified, 1, 1),
-                "A/B/A/X": S3PathStats(last_modified, 2, 1),
-                "A/B/A/Y": S3PathStats(last_modified, 2, 1),
-                "A/B/Y": S3PathStats(last_modified, 5, 1),
-            },
-            size_bytes_limit=5,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/A/",
-                f"{self.KEY_PREFIX}A/B/A/",
-                f"{self.KEY_PREFIX}A/B/Y",
-            },
-        )
+        self.assertEqual(mock_add_objects.call_count, len(pages))
+        self.assertEqual(s3_root.node.object_count, 3)
+        self.assertEqual(s3_root.node.size_bytes, 6)
+        self.assertEqual(s3_root.node["A"].size_bytes, 3)
 
-    def test__partition__partitions_by_count__partitions_at_varying_levels(self):
+    def test__refresh__concurrent__matches_serial(self):
         s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 1, 1),
-                "A/A/Y": S3PathStats(last_modified, 1, 1),
-                "A/B/A/X": S3PathStats(last_modified, 2, 1),
-                "A/B/A/Y": S3PathStats(last_modified, 2, 1),
-                "A/B/Y": S3PathStats(last_modified, 5, 1),
-            },
-            object_count_limit=2,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/A/",
-                f"{self.KEY_PREFIX}A/B/A/",
-                f"{self.KEY_PREFIX}A/B/Y",
-            },
+        self.mock_bucket(
+            s3_paths_stats=dict(
+                [
+                    self.get_s3_path_and_stats(key_suffix=key, size=size)
+                    for key, size in [("X", 1), ("A/X", 2), ("A/B/X", 3), ("B/X", 4)]
+                ]
+            )
         )
 
-    def test__partition__partitions_by_size_and_count__partitions_at_varying_levels(self):
-        s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 5, 1),
-                "A/A/Y": S3PathStats(last_modified, 1, 1),
-                "A/B/A/X": S3PathStats(last_modified, 2, 1),
-                "A/B/A/Y": S3PathStats(last_modified, 2, 1),
-                "A/B/Y": S3PathStats(last_modified, 1, 1),
-            },
-            size_bytes_limit=5,
-            object_count_limit=2,
-            expected_s3_node_keys={
-                f"{self.KEY_PREFIX}A/A/X",
-                f"{self.KEY_PREFIX}A/A/Y",
-                f"{self.KEY_PREFIX}A/B/A/",
-                f"{self.KEY_PREFIX}A/B/Y",
-            },
+        serial_root = S3FileSystem.from_path(s3_root_uri)
+        concurrent_root = S3FileSystem.from_path(s3_root_uri, concurrent=True, max_workers=2)
+
+        self.assertListEqual(
+            sorted(node.path for node in serial_root.node.list_nodes()),
+            sorted(node.path for node in concurrent_root.node.list_nodes()),
         )
+        self.assertEqual(concurrent_root.node.size_bytes, 10)
+        self.assertEqual(concurrent_root.node.object_count, 4)
 
-    def test__partition__partitions_by_size__no_partitioning_required(self):
+    def test__refresh__concurrent__buffers_at_most_one_page_per_worker(self):
         s3_root_uri = S3URI.build(bucket_name=self.BUCKET_NAME, key=self.KEY_PREFIX)
-        last_modified = get_current_time()
-        self.assertS3FileSystem_partition(
-            s3_root_uri=s3_root_uri,
-            key_stats_map={
-                "A/A/X": S3PathStats(last_modified, 1, 1),
-                "A/A/Y": S3PathStats(last_modified, 1, 1),
-                "A/B/X": S3PathStats(last_modified, 3, 1),
-                "A/B/Y": S3PathStats(last_modified, 2, 1),
-                "B/B/Y": S3PathStats(last_modified, 2, 1),
-            },
-            size_bytes_limit=10,
-            object_count_limit=10,
-            expected_s3_node_keys={f"{self.KEY_PREFIX}"},
+        self.mock_bucket(
+            s3_paths_stats=dict(
+                [
+                    self.get_s3_path_and_stats(key_suffix=f"{prefix}/{i}", size=1)
+                    for prefix in ["A", "B", "C"]
+                    for i in range(5)
+                ]
+            )
         )
 
-    def assertS3FileSystem_partition(
-        self,
-        s3_root_uri: S3URI,
-        key_stats_map: Dict[str, S3PathStats],
-        expected_s3_node_keys: Set[str],
-        size_bytes_limit: Optional[int] = None,
-        object_count_limit: Optional[int] = None,
-    ):
-        s3_paths_stats = dict(
-            [
-                self.get_s3_path_and_stats(
-                    key_suffix=key,
-                    size=stats.size_bytes,
-                    last_modified=stats.last_modified,
-                    bucket_name=s3_root_uri.bucket,
-                    key_prefix=s3_root_uri.key,
-                )
-                for key, stats in key_stats_map.items()
+        # Track pages that have been listed but not yet added to the tree
+        outstanding_pages = 0
+        peak_outstanding_pages = 0
+        listed_page_ids: Set[int] = set()
+        counter_lock = threading.Lock()
+        iter_pages = S3FileSystem._iter_pages
+        add_objects = S3FileSystem._add_objects
+
+        def single_object_pages(fs, s3, prefix):
+            nonlocal outstanding_pages, peak_outstanding_pages
+            for contents in iter_pages(fs, s3, prefix=prefix):
+                for obj in contents:
+                    page = [obj]
+                    with counter_lock:
+                        listed_page_ids.add(id(page))
+                        outstanding_pages += 1
+                        peak_outstanding_pages = max(peak_outstanding_pages, outstanding_pages)
+                    yield page
+
+        def add_page(fs, objects):
+            nonlocal outstanding_pages
+            add_objects(fs, objects)
+            with counter_lock:
+                # Top-level pages are listed directly, not through _iter_pages
+                if id(objects) in listed_page_ids:
+                    outstanding_pages -= 1
+
+        with mock.patch.object(S3FileSystem, "_iter_pages", single_object_pages):
+            with mock.patch.object(S3FileSystem, "_add_objects", add_page):
+                s3_root = S3FileSystem.from_path(s3_root_uri, concurrent=True, max_workers=2)
+
+        self.assertEqual(s3_root.node.object_count, 15)
+        self.assertLessEqual(peak_outstanding_pages, 2)
+
+
+PARTITION_CASES = [
+    param(
+        {"A/A/X": 5, "A/A/Y": 5, "A/B/X": 5, "A/B/Y": 5},
+        6,
+        None,
+        {"A/A/X", "A/A/Y", "A/B/X", "A/B/Y"},
+        id="by size partitions to object level",
+    ),
+    param(
+        {"A/X": 5, "A/B/X": 2, "A/B/Y": 2},
+        4,
+        None,
+        {"A/X", "A/B/"},
+        id="by size eats error obj too large",
+    ),
+    param(
+        {"A/A/X": 1, "A/A/Y": 1, "A/B/X": 1, "A/B/Y": 1},
+        2,
+        None,
+        {"A/A/", "A/B/"},
+        id="by size partitions at top level",
+    ),
+    param(
+        {"A/A/X": 1, "A/A/Y": 1, "A/B/X": 3, "A/B/Y": 2},
+        4,
+        None,
+        {"A/A/", "A/B/X", "A/B/Y"},
+        id="by size partitions at varying levels",
+    ),
+    param(
+        {"A/A/X": 1, "A/A/Y": 1, "A/B/A/X": 2, "A/B/A/Y": 2, "A/B/Y": 5},
+        5,
+        None,
+        {"A/A/", "A/B/A/", "A/B/Y"},
+        id="by size partitions at varying levels case 2",
+    ),
+    param(
+        {"A/A/X": 1, "A/A/Y": 1, "A/B/A/X": 2, "A/B/A/Y": 2, "A/B/Y": 5},
+        None,
+        2,
+        {"A/A/", "A/B/A/", "A/B/Y"},
+        id="by count partitions at varying levels",
+    ),
+    param(
+        {"A/A/X": 5, "A/A/Y": 1, "A/B/A/X": 2, "A/B/A/Y": 2, "A/B/Y": 1},
+        5,
+        2,
+        {"A/A/X", "A/A/Y", "A/B/A/", "A/B/Y"},
+        id="by size and count partitions at varying levels",
+    ),
+    param(
+        {"A/A/X": 1, "A/A/Y": 1, "A/B/X": 3, "A/B/Y": 2, "B/B/Y": 2},
+        10,
+        10,
+        {""},
+        id="no partitioning required",
+    ),
+]
+
+
+@mark.parametrize(
+    "file_sizes, size_bytes_limit, object_count_limit, expected_node_paths", PARTITION_CASES
+)
+def test__LocalFileSystem_partition(
+    tmp_path: Path,
+    file_sizes: Dict[str, int],
+    size_bytes_limit: Optional[int],
+    object_count_limit: Optional[int],
+    expected_node_paths: Set[str],
+):
+    write_files(tmp_path, {key: (size,) for key, size in file_sizes.items()})
+
+    local_root = LocalFileSystem.from_path(str(tmp_path))
+    local_nodes = local_root.partition(
+        size_bytes_limit=size_bytes_limit, object_count_limit=object_count_limit
+    )
+
+    assert {removeprefix(node.path, f"{tmp_path}/") for node in local_nodes} == expected_node_paths
+
+
+@mark.parametrize(
+    "file_sizes, size_bytes_limit, object_count_limit, expected_node_paths",
+    [
+        param({"": 5}, 6, None, {""}, id="by size partitions single object"),
+        *PARTITION_CASES,
+    ],
+)
+def test__S3FileSystem_partition(
+    file_sizes: Dict[str, int],
+    size_bytes_limit: Optional[int],
+    object_count_limit: Optional[int],
+    expected_node_paths: Set[str],
+):
+    key_prefix = "my-fav/prefix/"
+    last_modified = get_current_time()
+    mock_paginator = mock.MagicMock()
+    mock_paginator.paginate.return_value = [
+        {
+            "Contents": [
+                {"Key": f"{key_prefix}{key}", "Size": size, "LastModified": last_modified}
+                for key, size in file_sizes.items()
             ]
-        )
-        self.mock_bucket(s3_paths_stats=s3_paths_stats)
-
-        s3_root = S3FileSystem.from_path(s3_root_uri)
+        }
+    ]
+
+    with mock.patch(
+        "aibs_informatics_aws_utils.data_sync.file_system.get_s3_client"
+    ) as mock_get_s3_client:
+        mock_get_s3_client.return_value.get_paginator.return_value = mock_paginator
+        s3_root = S3FileSystem.from_path(S3URI.build("my-fav-bucket", key_prefix))
         s3_nodes = s3_root.partition(
             size_bytes_limit=size_bytes_limit, object_count_limit=object_count_limit
         )
-        s3_node_keys = {node.path for node in s3_nodes}
 
-        self.assertSetEqual(expected_s3_node_keys, s3_node_keys)
+    assert {node.path for node in s3_nodes} == {
+        f"{key_prefix}{path}" for path in expected_node_paths
+    }
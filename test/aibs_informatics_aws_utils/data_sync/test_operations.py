@@ -1,15 +1,24 @@
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from unittest import mock
 
-import moto
 from aibs_informatics_core.models.aws.s3 import S3URI
 from aibs_informatics_core.models.data_sync import RemoteToLocalConfig
 from aibs_informatics_core.utils.os_operations import find_all_paths
-from pytest import mark
+from pytest import TempPathFactory, mark
 
 from aibs_informatics_aws_utils.data_sync.operations import sync_data
-from aibs_informatics_aws_utils.s3 import get_s3_client, get_s3_resource, is_object, list_s3_paths
+from aibs_informatics_aws_utils.s3 import (
+    delete_s3_path,
+    get_s3_client,
+    get_s3_resource,
+    is_object,
+    should_sync,
+)
 from test.aibs_informatics_aws_utils.base import AwsBaseTest
 
 
@@ -17,56 +26,171 @@ def any_s3_uri(bucket: str = "bucket", key: str = "key") -> S3URI:
     return S3URI.build(bucket, key)
 
 
-@moto.mock_aws
-class OperationsTests(AwsBaseTest):
-    def setUp(self) -> None:
-        super().setUp()
-        self.set_region(self.DEFAULT_REGION)
-        self.DEFAULT_BUCKET_NAME = "a-random-bucket"
+# Pre-encoded file contents shared by the folder tests
+CONTENT_A = b"hello"
+CONTENT_B = b"did you hear me"
+
+
+@mark.usefixtures("tmp_factory_fixture")
+class OperationsTestsBase(AwsBaseTest):
+    tmp_factory: TempPathFactory
 
     def setUpLocalFS(self) -> Path:
-        fs = self.tmp_path()
+        fs = self.tmp_factory.mktemp(self._testMethodName, numbered=True)
         return fs
 
+    def put_file(self, path: Path, content: Union[bytes, str]) -> Path:
+        path.parent.mkdir(exist_ok=True, parents=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+        return path
+
+    def put_files(self, items: List[Tuple[Path, Union[bytes, str]]]) -> List[Path]:
+        return [self.put_file(path, content) for path, content in items]
+
+    def get_file(self, path: Path) -> str:
+        return path.read_text()
+
+    def assertLocalPathsEqual(self, src_path: Path, dst_path: Path, expected_num_files: int):
+        self._assertRelativePathsEqual(
+            src_path,
+            find_all_paths(src_path, False),
+            dst_path,
+            find_all_paths(dst_path, False),
+            expected_num_files,
+        )
+
+    def assertS3PathsEqual(self, src_path: S3URI, dst_path: S3URI, expected_num_files: int):
+        self._assertRelativePathsEqual(
+            src_path,
+            self.list_s3_keys(src_path),
+            dst_path,
+            self.list_s3_keys(dst_path),
+            expected_num_files,
+        )
+
+    def assertS3ToLocalPathsEqual(self, src_path: S3URI, dst_path: Path, expected_num_files: int):
+        self._assertRelativePathsEqual(
+            src_path,
+            self.list_s3_keys(src_path),
+            dst_path,
+            find_all_paths(dst_path, False),
+            expected_num_files,
+        )
+
+    def assertLocalToS3PathsEqual(self, src_path: Path, dst_path: S3URI, expected_num_files: int):
+        self._assertRelativePathsEqual(
+            src_path,
+            find_all_paths(src_path, False),
+            dst_path,
+            self.list_s3_keys(dst_path),
+            expected_num_files,
+        )
+
+    def _assertRelativePathsEqual(
+        self,
+        src_path: Union[Path, S3URI],
+        src_paths: List[str],
+        dst_path: Union[Path, S3URI],
+        dst_paths: List[str],
+        expected_num_files: int,
+    ):
+        self.assertEqual(len(src_paths), len(dst_paths), "number of files don't match")
+        self.assertEqual(expected_num_files, len(src_paths), "number of files don't match")
+
+        self.assertSetEqual(
+            self.get_relative_paths(src_path, src_paths),
+            self.get_relative_paths(dst_path, dst_paths),
+        )
+
+    @cached_property
+    def s3_client(self):
+        return get_s3_client(region=self.DEFAULT_REGION)
+
+    @cached_property
+    def s3_resource(self):
+        return get_s3_resource(region=self.DEFAULT_REGION)
+
+    def list_s3_keys(self, s3_path: S3URI) -> List[str]:
+        # Only the string form is compared, so keys are not wrapped in (validated) S3URIs
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        return [
+            f"s3://{s3_path.bucket}/{item['Key']}"
+            for page in paginator.paginate(Bucket=s3_path.bucket, Prefix=s3_path.key)
+            for item in page.get("Contents", [])
+        ]
+
+    @staticmethod
+    def get_relative_paths(
+        root: Union[Path, S3URI], paths: Iterable[Union[Path, S3URI, str]]
+    ) -> Set[str]:
+        # Prefix is computed once; the root itself (i.e. a single file) maps to ""
+        root_str = str(root).rstrip("/")
+        prefix = root_str + "/"
+        return {"" if _ == root_str else _.removeprefix(prefix) for _ in map(str, paths)}
+
+
+@mark.s3
+@mark.xdist_group(name="OperationsTests")
+@mark.usefixtures("shared_mock_aws_fixture")
+class OperationsTests(OperationsTestsBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.set_region(self.DEFAULT_REGION)
+        # The moto backend is shared across the class, so buckets are namespaced per test
+        self.DEFAULT_BUCKET_NAME = f"bucket-{uuid.uuid4().hex[:12]}"
+
     def setUpBucket(self, bucket_name: Optional[str] = None) -> str:
         bucket_name = bucket_name or self.DEFAULT_BUCKET_NAME
         self.s3_client.create_bucket(
             Bucket=bucket_name,
             CreateBucketConfiguration={"LocationConstraint": self.DEFAULT_REGION},  # type: ignore
         )
+        # The moto backend outlives the test, so drop what the test created
+        self.addCleanup(self.wipe_bucket, bucket_name)
         return bucket_name
 
+    def wipe_bucket(self, bucket_name: str):
+        # delete_s3_path removes objects with batched (<=1000 key) DeleteObjects requests
+        delete_s3_path(self.get_s3_path(key="", bucket_name=bucket_name))
+        self.s3_client.delete_bucket(Bucket=bucket_name)
+
     def put_object(
-        self, key: str, content: str, bucket_name: Optional[str] = None, **kwargs
+        self, key: str, content: Union[bytes, str], bucket_name: Optional[str] = None, **kwargs
     ) -> S3URI:
         bucket_name = bucket_name or self.DEFAULT_BUCKET_NAME
         self.s3_client.put_object(Bucket=bucket_name, Key=key, Body=content, **kwargs)
         return self.get_s3_path(key=key, bucket_name=bucket_name)
 
-    def get_object(self, key: str, bucket_name: Optional[str] = None) -> str:
+    def put_objects(
+        self, items: List[Tuple[str, Union[bytes, str]]], bucket_name: Optional[str] = None
+    ) -> List[S3URI]:
+        s3_client = self.s3_client  # resolve once before sharing it across threads
         bucket_name = bucket_name or self.DEFAULT_BUCKET_NAME
-        response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
-        return response["Body"].read().decode()
 
-    def put_file(self, path: Path, content: str) -> Path:
-        path.parent.mkdir(exist_ok=True, parents=True)
-        path.write_text(content)
-        return path
+        def _put_object(item: Tuple[str, Union[bytes, str]]) -> S3URI:
+            key, content = item
+            s3_client.put_object(Bucket=bucket_name, Key=key, Body=content)
+            return self.get_s3_path(key=key, bucket_name=bucket_name)
 
-    def get_file(self, path: Path) -> str:
-        return path.read_text()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(_put_object, items))
 
-    @property
-    def s3_client(self):
-        return get_s3_client(region=self.DEFAULT_REGION)
+    def seed_source(self, prefix: str, files: Dict[str, Union[bytes, str]]) -> S3URI:
+        """Create the default bucket and populate it with `files` keyed relative to `prefix`"""
+        self.setUpBucket()
+        self.put_objects([(prefix + key, content) for key, content in files.items()])
+        return self.get_s3_path(prefix)
 
-    @property
-    def s3_resource(self):
-        return get_s3_resource(region=self.DEFAULT_REGION)
+    def get_object(self, key: str, bucket_name: Optional[str] = None) -> str:
+        bucket_name = bucket_name or self.DEFAULT_BUCKET_NAME
+        response = self.s3_client.get_object(Bucket=bucket_name, Key=key)
+        return response["Body"].read().decode()
 
     def get_s3_path(self, key: str, bucket_name: Optional[str] = None) -> S3URI:
-        bucket_name = bucket_name or self.DEFAULT_BUCKET_NAME
-        return S3URI.build(bucket_name=bucket_name, key=key)
+        return any_s3_uri(bucket_name or self.DEFAULT_BUCKET_NAME, key)
 
     def client__list_objects_v2(self, **kwargs):
         if "Bucket" not in kwargs:
@@ -74,84 +198,61 @@ class OperationsTests(AwsBaseTest):
         return self.s3_client.list_objects_v2(**kwargs)
 
     def test__sync_data__s3_to_s3__folder__succeeds(self):
-        self.setUpBucket()
-        source_path = self.get_s3_path("source/path/")
-        destination_path = self.get_s3_path("destination/path/")
-        self.put_object("source/path/obj1", "hello")
-        self.put_object("source/path/dir1/obj2", "did you hear me")
-        result = sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=True,
-        )
-        self.assertPathsEqual(source_path, destination_path, 2)
-        self.assertEqual(result.files_transferred, 2)
-        self.assertEqual(result.bytes_transferred, 20)
-
-    def test__sync_data__s3_to_s3__folder__succeeds__no_detailed_response(self):
-        self.setUpBucket()
-        source_path = self.get_s3_path("source/path/")
-        destination_path = self.get_s3_path("destination/path/")
-        self.put_object("source/path/obj1", "hello")
-        self.put_object("source/path/dir1/obj2", "did you hear me")
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=False,
-        )
-        self.assertPathsEqual(source_path, destination_path, 2)
+        source_path = self.seed_source("source/path/", {"obj1": CONTENT_A, "dir1/obj2": CONTENT_B})
+        for include_detailed_response in (True, False):
+            with self.subTest(include_detailed_response=include_detailed_response):
+                destination_path = self.get_s3_path(
+                    f"destination/{include_detailed_response}/path/"
+                )
+                result = sync_data(
+                    source_path=source_path,
+                    destination_path=destination_path,
+                    include_detailed_response=include_detailed_response,
+                )
+                self.assertS3PathsEqual(source_path, destination_path, 2)
+                if include_detailed_response:
+                    self.assertEqual(result.files_transferred, 2)
+                    self.assertEqual(result.bytes_transferred, 20)
 
     def test__sync_data__s3_to_s3__file__succeeds(self):
         self.setUpBucket()
         source_path = self.put_object("source/path/obj1", "hello")
-        destination_path = self.get_s3_path("destination/path/")
-        result = sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=True,
-        )
-        self.assertPathsEqual(source_path, destination_path, 1)
-        self.assertEqual(result.files_transferred, 1)
-        self.assertEqual(result.bytes_transferred, 5)
-
-    def test__sync_data__s3_to_s3__file__succeeds__no_detailed_response(self):
-        self.setUpBucket()
-        source_path = self.put_object("source/path/obj1", "hello")
-        destination_path = self.get_s3_path("destination/path/")
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=False,
-        )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        for include_detailed_response in (True, False):
+            with self.subTest(include_detailed_response=include_detailed_response):
+                destination_path = self.get_s3_path(
+                    f"destination/{include_detailed_response}/path/"
+                )
+                result = sync_data(
+                    source_path=source_path,
+                    destination_path=destination_path,
+                    include_detailed_response=include_detailed_response,
+                )
+                self.assertS3PathsEqual(source_path, destination_path, 1)
+                if include_detailed_response:
+                    self.assertEqual(result.files_transferred, 1)
+                    self.assertEqual(result.bytes_transferred, 5)
 
     def test__sync_data__s3_to_s3__file__succeeds__source_deleted(self):
         self.setUpBucket()
-        source_path = self.put_object("source/path/obj1", "hello")
-        destination_path = self.get_s3_path("destination/path/")
-        result = sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            retain_source_data=False,
-            include_detailed_response=True,
-        )
-        assert self.get_object(destination_path.key) == "hello"
-        assert not is_object(source_path)
-        self.assertEqual(result.files_transferred, 1)
-        self.assertEqual(result.bytes_transferred, 5)
-
-    def test__sync_data__s3_to_s3__file__succeeds__source_deleted__no_detailed_response(self):
-        self.setUpBucket()
-        source_path = self.put_object("source/path/obj1", "hello")
-        destination_path = self.get_s3_path("destination/path/")
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            retain_source_data=False,
-            include_detailed_response=False,
-        )
-        assert self.get_object(destination_path.key) == "hello"
-        assert not is_object(source_path)
+        for include_detailed_response in (True, False):
+            with self.subTest(include_detailed_response=include_detailed_response):
+                source_path = self.put_object(
+                    f"source/{include_detailed_response}/path/obj1", "hello"
+                )
+                destination_path = self.get_s3_path(
+                    f"destination/{include_detailed_response}/path/"
+                )
+                result = sync_data(
+                    source_path=source_path,
+                    destination_path=destination_path,
+                    retain_source_data=False,
+                    include_detailed_response=include_detailed_response,
+                )
+                assert self.get_object(destination_path.key) == "hello"
+                assert not is_object(source_path)
+                if include_detailed_response:
+                    self.assertEqual(result.files_transferred, 1)
+                    self.assertEqual(result.bytes_transferred, 5)
 
     def test__sync_data__s3_to_s3__file__does_not_exist(self):
         self.setUpBucket()
@@ -167,146 +268,47 @@ class OperationsTests(AwsBaseTest):
         )
         assert not is_object(destination_path)
 
-    def test__sync_data__local_to_local__folder__succeeds(self):
+    def test__sync_data__s3_to_local__folder__succeeds(self):
         fs = self.setUpLocalFS()
-        source_path = fs / "source"
-        destination_path = fs / "destination"
-        self.put_file(source_path / "file1", "hello")
-        self.put_file(source_path / "file2", "did you hear me")
+        source_path = self.seed_source("source/path/", {"obj1": CONTENT_A, "dir1/obj2": CONTENT_B})
+        destination_path = fs / "destination2"
 
         result = sync_data(
             source_path=source_path,
             destination_path=destination_path,
             include_detailed_response=True,
         )
-        self.assertPathsEqual(source_path, destination_path, 2)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 2)
         self.assertEqual(result.files_transferred, 2)
         self.assertEqual(result.bytes_transferred, 20)
 
-    def test__sync_data__local_to_local__folder__succeeds__no_detailed_response(self):
-        fs = self.setUpLocalFS()
-        source_path = fs / "source"
-        destination_path = fs / "destination"
-        self.put_file(source_path / "file1", "hello")
-        self.put_file(source_path / "file2", "did you hear me")
-
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=False,
-        )
-        self.assertPathsEqual(source_path, destination_path, 2)
-
-    def test__sync_data__local_to_local__file__succeeds(self):
+    def test__sync_data__s3_to_local__folder__cached_results_mtime_updated(self):
         fs = self.setUpLocalFS()
-        source_path = fs / "source"
+        source_path = self.seed_source("source/path/", {"obj1": CONTENT_A, "dir1/obj2": CONTENT_B})
         destination_path = fs / "destination"
-        self.put_file(source_path, "hello")
 
         result = sync_data(
             source_path=source_path,
             destination_path=destination_path,
             include_detailed_response=True,
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
-        self.assertEqual(result.files_transferred, 1)
-        self.assertEqual(result.bytes_transferred, 5)
-
-    def test__sync_data__local_to_local__file__succeeds__no_detailed_response(self):
-        fs = self.setUpLocalFS()
-        source_path = fs / "source"
-        destination_path = fs / "destination"
-        self.put_file(source_path, "hello")
-
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=False,
-        )
-        self.assertPathsEqual(source_path, destination_path, 1)
-
-    def test__sync_data__local_to_local__relative_file__succeeds(self):
-        fs = self.setUpLocalFS()
-        source_path = fs / "source"
-        destination_path = fs / "destination"
-        self.put_file(source_path, "hello")
-        with self.chdir(fs):
-            result = sync_data(
-                source_path=Path("source"),
-                destination_path=Path("destination"),
-                include_detailed_response=True,
-            )
-        self.assertPathsEqual(source_path, destination_path, 1)
-        self.assertEqual(result.files_transferred, 1)
-        self.assertEqual(result.bytes_transferred, 5)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 2)
+        self.assertEqual(result.files_transferred, 2)
+        self.assertEqual(result.bytes_transferred, 20)
 
-    def test__sync_data__local_to_local__file__source_deleted(self):
-        fs = self.setUpLocalFS()
-        source_path = fs / "source"
-        destination_path = fs / "destination"
-        self.put_file(source_path, "hello")
+        # Second sync should find everything up to date and download nothing
+        sync_decisions: List[bool] = []
 
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            retain_source_data=False,
-        )
-        assert destination_path.read_text() == "hello"
-        assert not source_path.exists()
+        def should_sync_spy(*args, **kwargs) -> bool:
+            sync_decisions.append(should_sync(*args, **kwargs))
+            return sync_decisions[-1]
 
-    def test__sync_data__local_to_local__file__does_not_exist(self):
-        fs = self.setUpLocalFS()
-        source_path = fs / "source"
-        destination_path = fs / "destination"
-        with self.assertRaises(FileNotFoundError):
+        with mock.patch("aibs_informatics_aws_utils.s3.should_sync", side_effect=should_sync_spy):
             sync_data(
                 source_path=source_path,
                 destination_path=destination_path,
             )
-        sync_data(
-            source_path=source_path, destination_path=destination_path, fail_if_missing=False
-        )
-        assert not destination_path.exists()
-
-    def test__sync_data__s3_to_local__folder__succeeds(self):
-        fs = self.setUpLocalFS()
-        self.setUpBucket()
-        source_path = self.get_s3_path("source/path/")
-        self.put_object("source/path/obj1", "hello")
-        self.put_object("source/path/dir1/obj2", "did you hear me")
-        destination_path = fs / "destination2"
-
-        result = sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=True,
-        )
-        self.assertPathsEqual(source_path, destination_path, 2)
-        self.assertEqual(result.files_transferred, 2)
-        self.assertEqual(result.bytes_transferred, 20)
-
-    def test__sync_data__s3_to_local__folder__cached_results_mtime_updated(self):
-        fs = self.setUpLocalFS()
-        self.setUpBucket()
-        source_path = self.get_s3_path("source/path/")
-        self.put_object("source/path/obj1", "hello")
-        self.put_object("source/path/dir1/obj2", "did you hear me")
-        destination_path = fs / "destination"
-
-        result = sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-            include_detailed_response=True,
-        )
-        self.assertPathsEqual(source_path, destination_path, 2)
-        self.assertEqual(result.files_transferred, 2)
-        self.assertEqual(result.bytes_transferred, 20)
-
-        sync_data(
-            source_path=source_path,
-            destination_path=destination_path,
-        )
-        self.assertPathsEqual(source_path, destination_path, 2)
+        self.assertListEqual(sync_decisions, [False, False])
 
     def test__sync_data__s3_to_local__file__succeeds(self):
         fs = self.setUpLocalFS()
@@ -318,7 +320,7 @@ class OperationsTests(AwsBaseTest):
             destination_path=destination_path,
             include_detailed_response=True,
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 1)
         self.assertEqual(result.files_transferred, 1)
         self.assertEqual(result.bytes_transferred, 5)
 
@@ -332,7 +334,7 @@ class OperationsTests(AwsBaseTest):
             destination_path=destination_path,
             require_lock=True,
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 1)
 
     def test__sync_data__s3_to_local__file__source_not_deleted_despite_flag(self):
         fs = self.setUpLocalFS()
@@ -345,7 +347,7 @@ class OperationsTests(AwsBaseTest):
             destination_path=destination_path,
             retain_source_data=False,
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 1)
 
     def test__sync_data__s3_to_local__file__does_not_exist(self):
         fs = self.setUpLocalFS()
@@ -376,7 +378,7 @@ class OperationsTests(AwsBaseTest):
             destination_path=destination_path,
             remote_to_local_config=RemoteToLocalConfig(use_custom_tmp_dir=True),
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 1)
 
     def test__sync_data__s3_to_local__file__specified_custom_tmp_dir__succeeds(self):
         fs = self.setUpLocalFS()
@@ -391,21 +393,20 @@ class OperationsTests(AwsBaseTest):
                 custom_tmp_dir=fs,
             ),
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        self.assertS3ToLocalPathsEqual(source_path, destination_path, 1)
 
     def test__sync_data__local_to_s3__folder__succeeds(self):
         fs = self.setUpLocalFS()
         self.setUpBucket()
         source_path = fs / "source"
         destination_path = self.get_s3_path("destination/path")
-        self.put_file(source_path / "file1", "hello")
-        self.put_file(source_path / "file2", "did you hear me")
+        self.put_files([(source_path / "file1", CONTENT_A), (source_path / "file2", CONTENT_B)])
 
         sync_data(
             source_path=source_path,
             destination_path=destination_path,
         )
-        self.assertPathsEqual(source_path, destination_path, 2)
+        self.assertLocalToS3PathsEqual(source_path, destination_path, 2)
 
     def test__sync_data__local_to_s3__file__succeeds(self):
         fs = self.setUpLocalFS()
@@ -418,7 +419,7 @@ class OperationsTests(AwsBaseTest):
             source_path=source_path,
             destination_path=destination_path,
         )
-        self.assertPathsEqual(source_path, destination_path, 1)
+        self.assertLocalToS3PathsEqual(source_path, destination_path, 1)
 
     def test__sync_data__local_to_s3__file__source_deleted(self):
         fs = self.setUpLocalFS()
@@ -449,18 +450,84 @@ class OperationsTests(AwsBaseTest):
         )
         assert not is_object(destination_path)
 
-    def assertPathsEqual(
-        self, src_path: Union[Path, S3URI], dst_path: Union[Path, S3URI], expected_num_files: int
-    ):
-        is_src_local = isinstance(src_path, Path)
-        is_dst_local = isinstance(dst_path, Path)
-        src_paths = find_all_paths(src_path, False) if is_src_local else list_s3_paths(src_path)
-        dst_paths = find_all_paths(dst_path, False) if is_dst_local else list_s3_paths(dst_path)
 
-        self.assertEqual(len(src_paths), len(dst_paths), "number of files don't match")
-        self.assertEqual(expected_num_files, len(src_paths), "number of files don't match")
+@mark.local
+class LocalOperationsTests(OperationsTestsBase):
+    """Local-only sync tests; these never touch AWS, so no moto mock is started."""
 
-        self.assertSetEqual(
-            {str(_)[len(str(src_path)) :].lstrip("/") for _ in src_paths},
-            {str(_)[len(str(dst_path)) :].lstrip("/") for _ in dst_paths},
+    def test__sync_data__local_to_local__folder__succeeds(self):
+        fs = self.setUpLocalFS()
+        source_path = fs / "source"
+        self.put_files([(source_path / "file1", CONTENT_A), (source_path / "file2", CONTENT_B)])
+        for include_detailed_response in (True, False):
+            with self.subTest(include_detailed_response=include_detailed_response):
+                destination_path = fs / f"destination-{include_detailed_response}"
+                result = sync_data(
+                    source_path=source_path,
+                    destination_path=destination_path,
+                    include_detailed_response=include_detailed_response,
+                )
+                self.assertLocalPathsEqual(source_path, destination_path, 2)
+                if include_detailed_response:
+                    self.assertEqual(result.files_transferred, 2)
+                    self.assertEqual(result.bytes_transferred, 20)
+
+    def test__sync_data__local_to_local__file__succeeds(self):
+        fs = self.setUpLocalFS()
+        source_path = fs / "source"
+        self.put_file(source_path, "hello")
+        for include_detailed_response in (True, False):
+            with self.subTest(include_detailed_response=include_detailed_response):
+                destination_path = fs / f"destination-{include_detailed_response}"
+                result = sync_data(
+                    source_path=source_path,
+                    destination_path=destination_path,
+                    include_detailed_response=include_detailed_response,
+                )
+                self.assertLocalPathsEqual(source_path, destination_path, 1)
+                if include_detailed_response:
+                    self.assertEqual(result.files_transferred, 1)
+                    self.assertEqual(result.bytes_transferred, 5)
+
+    def test__sync_data__local_to_local__relative_file__succeeds(self):
+        fs = self.setUpLocalFS()
+        source_path = fs / "source"
+        destination_path = fs / "destination"
+        self.put_file(source_path, "hello")
+        with self.chdir(fs):
+            result = sync_data(
+                source_path=Path("source"),
+                destination_path=Path("destination"),
+                include_detailed_response=True,
+            )
+        self.assertLocalPathsEqual(source_path, destination_path, 1)
+        self.assertEqual(result.files_transferred, 1)
+        self.assertEqual(result.bytes_transferred, 5)
+
+    def test__sync_data__local_to_local__file__source_deleted(self):
+        fs = self.setUpLocalFS()
+        source_path = fs / "source"
+        destination_path = fs / "destination"
+        self.put_file(source_path, "hello")
+
+        sync_data(
+            source_path=source_path,
+            destination_path=destination_path,
+            retain_source_data=False,
         )
+        assert destination_path.read_text() == "hello"
+        assert not source_path.exists()
+
+    def test__sync_data__local_to_local__file__does_not_exist(self):
+        fs = self.setUpLocalFS()
+        source_path = fs / "source"
+        destination_path = fs / "destination"
+        with self.assertRaises(FileNotFoundError):
+            sync_data(
+                source_path=source_path,
+                destination_path=destination_path,
+            )
+        sync_data(
+            source_path=source_path, destination_path=destination_path, fail_if_missing=False
+        )
+        assert not destination_path.exists()
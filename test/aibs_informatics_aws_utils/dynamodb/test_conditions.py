@@ -1,3 +1,5 @@
+import gc
+import weakref
 from decimal import Decimal
 from typing import Any, Dict, Optional, Union
 
@@ -7,7 +9,7 @@ from aibs_informatics_core.models.aws.dynamodb import (
 )
 from aibs_informatics_test_resources import does_not_raise
 from boto3.dynamodb.conditions import Attr, ConditionBase, Key
-from pytest import mark, param
+from pytest import mark, param, raises
 
 from aibs_informatics_aws_utils.dynamodb.conditions import (
     ConditionBaseTranslator,
@@ -15,6 +17,33 @@ from aibs_informatics_aws_utils.dynamodb.conditions import (
     UpdateExpressionComponents,
 )
 
+# Condition trees and their serialized expressions, shared by the translator tests
+KEY_EQ_CONDITION = Key("k1").eq("s1")
+KEY_EQ_EXPRESSION = ConditionBaseExpression(
+    format="{0} {operator} {1}",
+    operator="=",
+    values=[AttributeBaseExpression("Key", "k1"), "s1"],
+)
+ATTR_EQ_CONDITION = Attr("a1").eq(1)
+ATTR_EQ_EXPRESSION = ConditionBaseExpression(
+    format="{0} {operator} {1}",
+    operator="=",
+    values=[AttributeBaseExpression("Attr", "a1"), 1],
+)
+KEY_EQ_AND_ATTR_LT_CONDITION = KEY_EQ_CONDITION & Attr("a1").lt(1)
+KEY_EQ_AND_ATTR_LT_EXPRESSION = ConditionBaseExpression(
+    format="({0} {operator} {1})",
+    operator="AND",
+    values=[
+        KEY_EQ_EXPRESSION,
+        ConditionBaseExpression(
+            format="{0} {operator} {1}",
+            operator="<",
+            values=[AttributeBaseExpression(attr_class="Attr", attr_name="a1"), 1],
+        ),
+    ],
+)
+
 
 @mark.parametrize(
     "condition, is_key, expected, expected_serialized_values",
@@ -61,6 +90,54 @@ def test__ExpressionComponents__from_condition(
     assert actual.expression_attribute_values__serialized == expected_serialized_values
 
 
+def test__ExpressionComponents__from_condition__repeated_conditions_are_independent():
+    first = ConditionExpressionComponents.from_condition(Key("key1").eq("str_value"), True)
+    first.expression_attribute_values[":v0"] = "mutated"
+
+    second = ConditionExpressionComponents.from_condition(Key("key1").eq("str_value"), True)
+    assert second == ConditionExpressionComponents(
+        "#n0 = :v0", {"#n0": "key1"}, {":v0": "str_value"}
+    )
+    # Equal but differently serialized values must not share a cache entry
+    assert ConditionExpressionComponents.from_condition(
+        Key("key1").eq(Decimal("1.50")), True
+    ).expression_attribute_values__serialized == {":v0": {"N": "1.50"}}
+    assert ConditionExpressionComponents.from_condition(
+        Key("key1").eq(Decimal("1.5")), True
+    ).expression_attribute_values__serialized == {":v0": {"N": "1.5"}}
+    assert ConditionExpressionComponents.from_condition(
+        Key("key1").eq(True), True
+    ).expression_attribute_values__serialized == {":v0": {"BOOL": True}}
+    assert ConditionExpressionComponents.from_condition(
+        Key("key1").eq(1), True
+    ).expression_attribute_values__serialized == {":v0": {"N": "1"}}
+
+
+def test__ExpressionComponents__from_condition__non_scalar_values_are_not_cached():
+    class Opaque:
+        def __repr__(self) -> str:
+            return "Opaque()"
+
+    # Distinct values that look identical by type and repr must not share a cache entry
+    first, second = Opaque(), Opaque()
+    assert ConditionExpressionComponents.from_condition(
+        Attr("key1").eq(first), False
+    ).expression_attribute_values == {":v0": first}
+    assert ConditionExpressionComponents.from_condition(
+        Attr("key1").eq(second), False
+    ).expression_attribute_values == {":v0": second}
+
+
+def test__ExpressionComponents__from_condition__cache_does_not_keep_conditions_alive():
+    condition = Key("key1").eq("not_retained")
+    condition_ref = weakref.ref(condition)
+    ConditionExpressionComponents.from_condition(condition, True)
+
+    del condition
+    gc.collect()
+    assert condition_ref() is None
+
+
 @mark.parametrize(
     "attributes, expected, expected_serialized_values",
     [
@@ -169,6 +246,24 @@ def test__UpdateExpressionComponents__from_dict(
             ),
             id="Complex Expressions with partial collisions",
         ),
+        param(
+            ConditionExpressionComponents(
+                "(#n0 = :v0 AND #n1 = :v1)",
+                {"#n0": "key1", "#n1": "key2"},
+                {":v0": {"S": "str_value"}, ":v1": {"N": "1.5"}},
+            ),
+            ConditionExpressionComponents(
+                "(#n0 = :v0 AND (#n1 = :v1 OR #n1 = :v0))",
+                {"#n0": "key3", "#n1": "key4"},
+                {":v0": {"S": "other_value"}, ":v1": {"N": "1.6"}},
+            ),
+            ConditionExpressionComponents(
+                "(#n2 = :v2 AND (#n3 = :v3 OR #n3 = :v2))",
+                {"#n2": "key3", "#n3": "key4"},
+                {":v2": {"S": "other_value"}, ":v3": {"N": "1.6"}},
+            ),
+            id="Repeated placeholders are renumbered in order",
+        ),
     ],
 )
 def test__ExpressionComponents__fix_collisions(
@@ -180,26 +275,28 @@ def test__ExpressionComponents__fix_collisions(
     assert actual == expected
 
 
+@mark.parametrize("placeholder", ["#0", "n0", "#n", "#n0x"])
+def test__ExpressionComponents__fix_collisions__fails_for_invalid_placeholder(placeholder):
+    this = ConditionExpressionComponents("#n0 = :v0", {"#n0": "key1"}, {":v0": 1})
+    other = ConditionExpressionComponents(
+        f"{placeholder} = :v0", {placeholder: "key2"}, {":v0": 2}
+    )
+    with raises(ValueError, match=repr(placeholder)):
+        this.fix_collisions(other)
+
+
 @mark.parametrize(
     "condition, expression, raises_error",
     [
         param(
-            Key("k1").eq("s1"),
-            ConditionBaseExpression(
-                format="{0} {operator} {1}",
-                operator="=",
-                values=[AttributeBaseExpression("Key", "k1"), "s1"],
-            ),
+            KEY_EQ_CONDITION,
+            KEY_EQ_EXPRESSION,
             does_not_raise(),
             id="KEY.EQ Condition",
         ),
         param(
-            Attr("a1").eq(1),
-            ConditionBaseExpression(
-                format="{0} {operator} {1}",
-                operator="=",
-                values=[AttributeBaseExpression("Attr", "a1"), 1],
-            ),
+            ATTR_EQ_CONDITION,
+            ATTR_EQ_EXPRESSION,
             does_not_raise(),
             id="ATTR.EQ Condition",
         ),
@@ -214,25 +311,27 @@ def test__ExpressionComponents__fix_collisions(
             id="ATTR.BETWEEN Condition",
         ),
         param(
-            Key("k1").eq("s1") & Attr("a1").lt(1),
+            KEY_EQ_AND_ATTR_LT_CONDITION,
+            KEY_EQ_AND_ATTR_LT_EXPRESSION,
+            does_not_raise(),
+            id="KEY.EQ AND ATTR.LT Condition",
+        ),
+        param(
+            Attr("a1").size().gt(3),
             ConditionBaseExpression(
-                format="({0} {operator} {1})",
-                operator="AND",
+                format="{0} {operator} {1}",
+                operator=">",
                 values=[
                     ConditionBaseExpression(
-                        format="{0} {operator} {1}",
-                        operator="=",
-                        values=[AttributeBaseExpression(attr_class="Key", attr_name="k1"), "s1"],
-                    ),
-                    ConditionBaseExpression(
-                        format="{0} {operator} {1}",
-                        operator="<",
-                        values=[AttributeBaseExpression(attr_class="Attr", attr_name="a1"), 1],
+                        format="{operator}({0})",
+                        operator="size",
+                        values=[AttributeBaseExpression(attr_class="Attr", attr_name="a1")],
                     ),
+                    3,
                 ],
             ),
             does_not_raise(),
-            id="KEY.EQ AND ATTR.LT Condition",
+            id="ATTR.SIZE.GT Condition",
         ),
     ],
 )
@@ -250,49 +349,26 @@ def test__ConditionBaseTranslator__serialize_condition(
     "expression, condition, raises_error",
     [
         param(
-            ConditionBaseExpression(
-                format="{0} {operator} {1}",
-                operator="=",
-                values=[AttributeBaseExpression("Key", "k1"), "s1"],
-            ),
-            Key("k1").eq("s1"),
+            KEY_EQ_EXPRESSION,
+            KEY_EQ_CONDITION,
             does_not_raise(),
             id="KEY.EQ Condition",
         ),
         param(
             "k1=s1",
-            Key("k1").eq("s1"),
+            KEY_EQ_CONDITION,
             does_not_raise(),
             id="KEY.EQ Condition (String)",
         ),
         param(
-            ConditionBaseExpression(
-                format="{0} {operator} {1}",
-                operator="=",
-                values=[AttributeBaseExpression("Attr", "a1"), 1],
-            ),
-            Attr("a1").eq(1),
+            ATTR_EQ_EXPRESSION,
+            ATTR_EQ_CONDITION,
             does_not_raise(),
             id="ATTR.EQ Condition",
         ),
         param(
-            ConditionBaseExpression(
-                format="({0} {operator} {1})",
-                operator="AND",
-                values=[
-                    ConditionBaseExpression(
-                        format="{0} {operator} {1}",
-                        operator="=",
-                        values=[AttributeBaseExpression(attr_class="Key", attr_name="k1"), "s1"],
-                    ),
-                    ConditionBaseExpression(
-                        format="{0} {operator} {1}",
-                        operator="<",
-                        values=[AttributeBaseExpression(attr_class="Attr", attr_name="a1"), 1],
-                    ),
-                ],
-            ),
-            Key("k1").eq("s1") & Attr("a1").lt(1),
+            KEY_EQ_AND_ATTR_LT_EXPRESSION,
+            KEY_EQ_AND_ATTR_LT_CONDITION,
             does_not_raise(),
             id="KEY.EQ AND ATTR.LT Condition",
         ),
@@ -308,3 +384,19 @@ def test__ConditionBaseTranslator__deserialize_condition(
 
     if condition:
         assert actual == condition
+
+
+def test__ConditionBaseTranslator__deserialize_condition__string_respects_is_key():
+    deserialize_condition = ConditionBaseTranslator.deserialize_condition
+    # Parsed strings are cached, so alternate is_key to check it is part of the cache key
+    assert deserialize_condition("k1=s1", is_key=True) == Key("k1").eq("s1")
+    assert deserialize_condition("k1=s1", is_key=False) == Attr("k1").eq("s1")
+    assert deserialize_condition("k1=s1", is_key=True) == Key("k1").eq("s1")
+
+
+def test__ConditionBaseTranslator__deserialize_condition__string_results_are_independent():
+    deserialize_condition = ConditionBaseTranslator.deserialize_condition
+    first = deserialize_condition("k1 IN (a, b)", is_key=False)
+    first.get_expression()["values"][1].append("c")
+
+    assert deserialize_condition("k1 IN (a, b)", is_key=False) == Attr("k1").is_in(["a", "b"])
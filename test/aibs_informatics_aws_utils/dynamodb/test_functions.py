@@ -1,7 +1,13 @@
+import json
+import sys
+import uuid
+from collections import Counter, OrderedDict, defaultdict
 from copy import deepcopy
 from decimal import Decimal
-from operator import itemgetter
-from typing import Dict, List
+from enum import Enum, IntEnum
+from functools import cached_property
+from types import SimpleNamespace
+from typing import Any, Dict, FrozenSet, List, Tuple
 
 import boto3
 import moto
@@ -25,13 +31,17 @@ from aibs_informatics_aws_utils.dynamodb.functions import (
 )
 from test.aibs_informatics_aws_utils.base import AwsBaseTest
 
+# Keep this module on one xdist worker, so the shared moto mock and table get reused
+pytestmark = pytest.mark.xdist_group("dynamodb_functions")
+
 
 class DynamoDBTests(AwsBaseTest):
     def setUp(self) -> None:
         super().setUp()
         self.set_env_base_env_var()
         self.set_region(self.DEFAULT_REGION)
-        self.DEFAULT_TABLE_NAME = "a-random-table"
+        # Unique per test, in case the module's shared moto mock is active
+        self.DEFAULT_TABLE_NAME = f"a-random-table-{uuid.uuid4().hex[:8]}"
         self.DEFAULT_KEY_SCHEMA = [{"AttributeName": "key", "KeyType": "HASH"}]
         self.DEFAULT_ATTR_DEFS = [{"AttributeName": "key", "AttributeType": "S"}]
         self.DEFAULT_PROV_THROUGHPUT = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
@@ -53,11 +63,11 @@ class DynamoDBTests(AwsBaseTest):
         )
         return table_name
 
-    @property
+    @cached_property
     def ddb(self):
         return get_dynamodb_client(region=self.DEFAULT_REGION)
 
-    @property
+    @cached_property
     def ddb_resource(self):
         return get_dynamodb_resource(region=self.DEFAULT_REGION)
 
@@ -100,9 +110,86 @@ class DynamoDBTests(AwsBaseTest):
                 table_get_item(table_name, {"key": "k1"}), {"key": "k1", "my_attr": True}
             )
 
+    def test__table_put_item__passes_resource_kwargs_through(self):
+        with moto.mock_aws():
+            table_name = self.setUpTable()
+            table_put_item(
+                table_name,
+                {"key": "k1", "my_attr": 1},
+                ConditionExpression=Attr("key").not_exists(),
+            )
+            with self.assertRaises(ClientError):
+                table_put_item(
+                    table_name,
+                    {"key": "k1", "my_attr": 2},
+                    ConditionExpression=Attr("key").not_exists(),
+                )
+            table_put_item(
+                table_name,
+                {"key": "k1", "my_attr": 3},
+                ConditionExpression="#a = :v",
+                ExpressionAttributeNames={"#a": "my_attr"},
+                ExpressionAttributeValues={":v": 1},
+            )
+            table_put_item(
+                table_name,
+                {"key": "k1", "my_attr": 4},
+                Expected={"my_attr": {"Value": 3, "ComparisonOperator": "EQ"}},
+            )
+            self.assertDictEqual(
+                table_get_item(table_name, {"key": "k1"}), {"key": "k1", "my_attr": 4}
+            )
+
+    def test__table_put_item__returns_deserialized_old_attributes(self):
+        with moto.mock_aws():
+            table_name = self.setUpTable()
+            table_put_item(table_name, {"key": "k1", "my_attr": Decimal("1.5")})
+            response = table_put_item(
+                table_name, {"key": "k1", "my_attr": Decimal("2")}, ReturnValues="ALL_OLD"
+            )
+            self.assertDictEqual(response["Attributes"], {"key": "k1", "my_attr": Decimal("1.5")})
+
+    def test__table_get_item__handles_projection_and_missing_item(self):
+        with moto.mock_aws():
+            table_name = self.setUpTable()
+            table_put_item(table_name, {"key": "k1", "my_attr": {"nested": ["a", 1]}})
+            self.assertDictEqual(
+                table_get_item(table_name, {"key": "k1"}, attrs="my_attr"),
+                {"my_attr": {"nested": ["a", Decimal("1")]}},
+            )
+            self.assertIsNone(table_get_item(table_name, {"key": "k2"}))
+            self.assertDictEqual(
+                table_get_item(table_name, {"key": "k1"}, attrs=["key"]), {"key": "k1"}
+            )
+
+
+def as_multiset(items: List[Dict[str, Any]]) -> Counter[FrozenSet[Tuple[str, Any]]]:
+    """Order-independent view of flat (hashable valued) items for equality checks"""
+    return Counter(frozenset(item.items()) for item in items)
+
+
+@pytest.fixture(scope="module")
+def shared_mock_dynamodb_fixture():
+    """Start one moto mock for this module, so mock tables can outlive a single test.
+
+    Yields a dict used by `mock_dynamodb_fixture` to track the schema of the current mock table.
+    """
+    with moto.mock_aws():
+        yield {}
+
+
+@pytest.fixture(scope="module")
+def ddb_api(shared_mock_dynamodb_fixture) -> SimpleNamespace:
+    """DynamoDB functions under test, imported once while the module's moto mock is active"""
+    # Follows best practices outlined in:
+    # http://docs.getmoto.org/en/latest/docs/getting_started.html#what-about-those-pesky-imports
+    from aibs_informatics_aws_utils.dynamodb import table_get_items, table_query, table_scan
+
+    return SimpleNamespace(query=table_query, scan=table_scan, get_items=table_get_items)
+
 
 @pytest.fixture(scope="function")
-def mock_dynamodb_fixture(aws_credentials_fixture, request):
+def mock_dynamodb_fixture(aws_credentials_fixture, shared_mock_dynamodb_fixture, request):
     default_attr_def = [
         {"AttributeName": "PK", "AttributeType": "S"},
         {"AttributeName": "SK", "AttributeType": "S"},
@@ -127,9 +214,27 @@ def mock_dynamodb_fixture(aws_credentials_fixture, request):
     table_default_items = request.param.get("table_default_items", default_items)
     index_updates = request.param.get("table_index_updates", default_index_updates)
 
-    with moto.mock_aws():
-        mock_table_name = "mock-table"
-        mock_client = boto3.client("dynamodb")
+    mock_table_name = "mock-table"
+    mock_client = boto3.client("dynamodb")
+    mock_table = boto3.resource("dynamodb").Table(mock_table_name)
+    key_names = [_["AttributeName"] for _ in key_schema]
+
+    table_state = shared_mock_dynamodb_fixture
+    table_schema = json.dumps([attribute_defs, key_schema, index_updates], sort_keys=True)
+    if table_state.get("schema") == table_schema:
+        # Same schema as the previous test: keep the table (and its indexes), drop its items
+        with mock_table.batch_writer() as batch:
+            scan_kwargs: Dict[str, Any] = {}
+            while True:
+                response = mock_table.scan(**scan_kwargs)
+                for item in response["Items"]:
+                    batch.delete_item(Key={k: item[k] for k in key_names})
+                if "LastEvaluatedKey" not in response:
+                    break
+                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    else:
+        if "schema" in table_state:
+            mock_client.delete_table(TableName=mock_table_name)
         mock_client.create_table(
             AttributeDefinitions=attribute_defs,
             TableName=mock_table_name,
@@ -141,12 +246,15 @@ def mock_dynamodb_fixture(aws_credentials_fixture, request):
             mock_client.update_table(
                 TableName=mock_table_name, GlobalSecondaryIndexUpdates=index_updates
             )
+        table_state["schema"] = table_schema
 
-        mock_table = boto3.resource("dynamodb").Table(mock_table_name)
+    # Batched into 25 item BatchWriteItem requests; duplicate keys keep the last item,
+    # as sequential put_item calls would.
+    with mock_table.batch_writer(overwrite_by_pkeys=key_names) as batch:
         for i in table_default_items:
-            mock_table.put_item(Item=i)
+            batch.put_item(Item=i)
 
-        yield mock_table_name
+    yield mock_table_name
 
 
 @pytest.mark.parametrize(
@@ -303,15 +411,16 @@ def mock_dynamodb_fixture(aws_credentials_fixture, request):
     indirect=["mock_dynamodb_fixture"],
 )
 def test__table_query(
-    mock_dynamodb_fixture, key_condition_expression, index_name, filter_expression, expected
+    ddb_api,
+    mock_dynamodb_fixture,
+    key_condition_expression,
+    index_name,
+    filter_expression,
+    expected,
 ):
     mock_table_name = mock_dynamodb_fixture
 
-    # Follows best practices outlined in:
-    # http://docs.getmoto.org/en/latest/docs/getting_started.html#what-about-those-pesky-imports
-    from aibs_informatics_aws_utils.dynamodb import table_query
-
-    actual_result = table_query(
+    actual_result = ddb_api.query(
         table_name=mock_table_name,
         key_condition_expression=key_condition_expression,
         index_name=index_name,
@@ -427,17 +536,18 @@ def test__table_query(
     ],
     indirect=["mock_dynamodb_fixture"],
 )
-def test__table_scan(mock_dynamodb_fixture, index_name, filter_expression, expected):
+def test__table_scan(ddb_api, mock_dynamodb_fixture, index_name, filter_expression, expected):
     mock_table_name = mock_dynamodb_fixture
 
-    # Follows best practices outlined in:
-    # http://docs.getmoto.org/en/latest/docs/getting_started.html#what-about-those-pesky-imports
-    from aibs_informatics_aws_utils.dynamodb import table_scan
-
-    actual_result = table_scan(
+    actual_result = ddb_api.scan(
         table_name=mock_table_name, index_name=index_name, filter_expression=filter_expression
     )
-    assert sorted(expected, key=itemgetter("PK")) == sorted(actual_result, key=itemgetter("PK"))
+    assert as_multiset(expected) == as_multiset(actual_result)
+
+
+# More keys than a single BatchGetItem request (100) allows; built once for all params
+OVERFLOW_ITEMS = [{"PK": str(i), "SK": str(i + 1), "ATTR1": str(i)} for i in range(500)]
+OVERFLOW_KEYS = [{"PK": item["PK"], "SK": item["SK"]} for item in OVERFLOW_ITEMS[:250]]
 
 
 @pytest.mark.parametrize(
@@ -498,97 +608,217 @@ def test__table_scan(mock_dynamodb_fixture, index_name, filter_expression, expec
             # mock_dynamodb_fixture
             {
                 "table_index_updates": [],
-                "table_default_items": [
-                    {"PK": str(i), "SK": str(i + 1), "ATTR1": str(i)} for i in range(500)
-                ],
+                "table_default_items": OVERFLOW_ITEMS,
             },
             # keys
-            [{"PK": str(i), "SK": str(i + 1)} for i in range(250)],
+            OVERFLOW_KEYS,
             # attrs
             None,
             # expected
-            [{"PK": str(i), "SK": str(i + 1), "ATTR1": str(i)} for i in range(250)],
+            OVERFLOW_ITEMS[:250],
             # id
             id="Get_items - handles overflow",
         ),
+        pytest.param(
+            # mock_dynamodb_fixture
+            {
+                "table_index_updates": [],
+                "table_default_items": OVERFLOW_ITEMS,
+            },
+            # keys
+            OVERFLOW_KEYS,
+            # attrs
+            "PK, SK",
+            # expected
+            OVERFLOW_KEYS,
+            # id
+            id="Get_items - handles overflow with projection expression",
+        ),
+        pytest.param(
+            # mock_dynamodb_fixture
+            {
+                "table_index_updates": [],
+                "table_default_items": [
+                    {"PK": "a", "SK": "b", "ATTR1": "c", "name": "n1"},
+                    {"PK": "d", "SK": "e", "ATTR1": "f", "name": "n2"},
+                ],
+            },
+            # keys
+            [{"PK": "a", "SK": "b"}, {"PK": "d", "SK": "e"}],
+            # attrs ("name" is a reserved word)
+            ["PK", "name"],
+            # expected
+            [{"PK": "a", "name": "n1"}, {"PK": "d", "name": "n2"}],
+            # id
+            id="Get_items - projected attribute names",
+        ),
     ],
     indirect=["mock_dynamodb_fixture"],
 )
-def test__table_get_items(mock_dynamodb_fixture, keys, attrs, expected):
+def test__table_get_items(ddb_api, mock_dynamodb_fixture, keys, attrs, expected):
     mock_table_name = mock_dynamodb_fixture
 
-    # Follows best practices outlined in:
-    # http://docs.getmoto.org/en/latest/docs/getting_started.html#what-about-those-pesky-imports
-    from aibs_informatics_aws_utils.dynamodb import table_get_items
-
-    actual_result = table_get_items(table_name=mock_table_name, keys=keys, attrs=attrs)
-    print(actual_result)
-    assert sorted(expected, key=itemgetter("PK")) == sorted(actual_result, key=itemgetter("PK"))
+    actual_result = ddb_api.get_items(table_name=mock_table_name, keys=keys, attrs=attrs)
+    assert as_multiset(expected) == as_multiset(actual_result)
+
+
+def typed(obj: Any) -> Any:
+    """Pair every leaf with its type, so that e.g. `Decimal("1.5")` and `1.5` compare unequal"""
+    if isinstance(obj, dict):
+        return {k: typed(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [typed(v) for v in obj]
+    return (type(obj), obj)
+
+
+# (item with Decimals, same item with floats)
+CONVERT_CORPUS = [
+    pytest.param(
+        {"a": Decimal("10.5"), "b": {"c": Decimal("20.5")}, "d": [Decimal("30.5")]},
+        {"a": 10.5, "b": {"c": 20.5}, "d": [30.5]},
+        id="mixed containers",
+    ),
+    pytest.param(
+        {"a": {"b": {"c": {"d": Decimal("10.5")}}}},
+        {"a": {"b": {"c": {"d": 10.5}}}},
+        id="deeply nested",
+    ),
+    pytest.param(
+        {"PK": "a", "n": 1, "l": [Decimal("0.1"), "x", [{"f": Decimal("-2.25")}]]},
+        {"PK": "a", "n": 1, "l": [0.1, "x", [{"f": -2.25}]]},
+        id="lists of dicts",
+    ),
+    pytest.param({"a": Decimal("10.5")}, {"a": 10.5}, id="flat"),
+]
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+@pytest.mark.parametrize("decimal_item, float_item", CONVERT_CORPUS)
+def test__convert_decimals_to_floats(decimal_item, float_item, in_place):
+    item = deepcopy(decimal_item)
+    actual = convert_decimals_to_floats(item, in_place=in_place)
+    assert typed(actual) == typed(float_item)
+    assert (actual is item) == in_place
+    if not in_place:
+        assert typed(item) == typed(decimal_item)
+    # converting again is a no-op
+    assert typed(convert_decimals_to_floats(actual)) == typed(float_item)
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+@pytest.mark.parametrize("decimal_item, float_item", CONVERT_CORPUS)
+def test__convert_floats_to_decimals(decimal_item, float_item, in_place):
+    item = deepcopy(float_item)
+    actual = convert_floats_to_decimals(item, in_place=in_place)
+    assert typed(actual) == typed(decimal_item)
+    assert (actual is item) == in_place
+    if not in_place:
+        assert typed(item) == typed(float_item)
+    # converting again is a no-op
+    assert typed(convert_floats_to_decimals(actual)) == typed(decimal_item)
+
+
+@pytest.mark.parametrize("decimal_item, float_item", CONVERT_CORPUS)
+def test__convert__round_trip_is_identity(decimal_item, float_item):
+    floats = convert_decimals_to_floats(decimal_item, in_place=False)
+    assert typed(convert_floats_to_decimals(floats, in_place=False)) == typed(decimal_item)
+
+
+def test__convert_floats_to_decimals__not_in_place__keeps_sets_and_precise_decimals():
+    precise = Decimal("0.10000000000000000000001")
+    item = {"a": 10.5, "b": {"c": precise}, "d": {"x", "y"}}
+    expected = {"a": Decimal("10.5"), "b": {"c": precise}, "d": {"x", "y"}}
+    actual = convert_floats_to_decimals(item, in_place=False)
+    assert actual == expected
+    assert item["a"] == 10.5 and type(item["a"]) is float
 
 
-def test__convert_decimals_to_floats__default_args():
-    item = {"a": Decimal("10.5"), "b": {"c": Decimal("20.5")}, "d": [Decimal("30.5")]}
-    expected = {"a": 10.5, "b": {"c": 20.5}, "d": [30.5]}
-    actual = convert_decimals_to_floats(item)
+def test__convert_decimals_to_floats__not_in_place__keeps_bytes_and_sets():
+    item = {"a": Decimal("10.5"), "b": [b"bytes", Decimal("1")], "d": {"x", "y"}}
+    expected = {"a": 10.5, "b": [b"bytes", 1.0], "d": {"x", "y"}}
+    actual = convert_decimals_to_floats(item, in_place=False)
     assert actual == expected
-    assert item is actual
+    assert type(item["a"]) is Decimal
+    assert actual["b"] is not item["b"] and actual["d"] is not item["d"]
 
 
-def test__convert_floats_to_decimals__default_args():
-    item = {"a": 10.5, "b": {"c": 20.5}, "d": [30.5]}
-    expected = {"a": Decimal("10.5"), "b": {"c": Decimal("20.5")}, "d": [Decimal("30.5")]}
-    actual = convert_floats_to_decimals(item)
-    assert actual == expected
-    assert item is actual
+class Color(str, Enum):
+    RED = "red"
 
 
-def test__convert_decimals_to_floats__not_in_place():
-    item = {"a": Decimal("10.5"), "b": {"c": Decimal("20.5")}, "d": [Decimal("30.5")]}
-    expected = deepcopy(item)
-    actual = convert_decimals_to_floats(expected, in_place=False)
-    assert actual == expected
-    assert item is not actual
+class Size(IntEnum):
+    SMALL = 1
 
 
-def test__convert_floats_to_decimals__not_in_place():
-    item = {"a": 10.5, "b": {"c": 20.5}, "d": [30.5]}
-    expected = deepcopy(item)
-    actual = convert_floats_to_decimals(expected, in_place=False)
-    assert actual == expected
-    assert item is not actual
+@pytest.mark.parametrize("in_place", [True, False])
+@pytest.mark.parametrize(
+    "convert, value, converted",
+    [
+        pytest.param(convert_floats_to_decimals, 2.5, Decimal("2.5"), id="floats to decimals"),
+        pytest.param(convert_decimals_to_floats, Decimal("2.5"), 2.5, id="decimals to floats"),
+    ],
+)
+def test__convert__preserves_tuples_non_str_keys_and_enums(convert, value, converted, in_place):
+    item = {"t": (value, "x"), "n": {1: value}, "e": [Color.RED, Size.SMALL]}
 
+    actual = convert(item, in_place=in_place)
 
-def test__convert_decimals_to_floats__deeply_nested():
-    item = {"a": {"b": {"c": {"d": Decimal("10.5")}}}}
-    expected = {"a": {"b": {"c": {"d": 10.5}}}}
-    actual = convert_decimals_to_floats(item)
-    assert actual == expected
-    assert item is actual
+    # tuples are left as they are, as are Enum members and non-str keys
+    assert type(actual["t"]) is tuple
+    assert type(actual["t"][0]) is type(value)
+    assert list(actual["n"]) == [1]
+    assert type(actual["n"][1]) is type(converted)
+    assert actual["e"][0] is Color.RED
+    assert actual["e"][1] is Size.SMALL
 
 
-def test__convert_floats_to_decimals__deeply_nested():
-    item = {"a": {"b": {"c": {"d": 10.5}}}}
-    expected = {"a": {"b": {"c": {"d": Decimal("10.5")}}}}
-    assert convert_floats_to_decimals(item) == expected
+class Items(list):
+    pass
 
 
-def test__convert_decimals_to_floats__handles_multiple_calls():
-    item = {"a": Decimal("10.5")}
-    expected = {"a": 10.5}
-    actual = convert_decimals_to_floats(item)
-    assert actual == expected
-    assert item is actual
-    actual = convert_decimals_to_floats(actual)
-    assert actual == expected
-    assert item is actual
+def test__convert_floats_to_decimals__not_in_place__preserves_container_types():
+    item = {
+        "o": OrderedDict([("b", 1.5), ("a", 2.5)]),
+        "d": defaultdict(list, {"x": [0.5]}),
+        "l": Items([{"f": 3.5}]),
+    }
 
+    actual = convert_floats_to_decimals(item, in_place=False)
 
-def test__convert_floats_to_decimals__handles_multiple_calls():
-    item = {"a": 10.5}
-    expected = {"a": Decimal("10.5")}
-    actual = convert_floats_to_decimals(item)
-    assert actual == expected
-    assert item is actual
-    actual = convert_floats_to_decimals(actual)
+    assert type(actual["o"]) is OrderedDict
+    assert list(actual["o"].items()) == [("b", Decimal("1.5")), ("a", Decimal("2.5"))]
+    assert type(actual["d"]) is defaultdict and actual["d"].default_factory is list
+    assert actual["d"] == {"x": [Decimal("0.5")]}
+    assert type(actual["l"]) is Items and actual["l"] == [{"f": Decimal("3.5")}]
+    # the original item is left untouched
+    assert item["o"]["b"] == 1.5 and type(item["o"]["b"]) is float
+    assert type(item["d"]["x"][0]) is float
+    assert type(item["l"][0]["f"]) is float
+
+    # as is the type of the item itself, with or without anything to convert
+    assert type(convert_floats_to_decimals(OrderedDict(a=1.5), in_place=False)) is OrderedDict
+    assert type(convert_floats_to_decimals(OrderedDict(a=1), in_place=False)) is OrderedDict
+
+
+@pytest.mark.parametrize("convert", [convert_decimals_to_floats, convert_floats_to_decimals])
+def test__convert__flat_item_with_nothing_to_convert(convert):
+    item = {"PK": "a", "SK": "b", "n": 1, "flag": True, "empty": None}
+    expected = deepcopy(item)
+
+    assert convert(item) is item
+    actual = convert(item, in_place=False)
     assert actual == expected
-    assert item is actual
+    assert actual is not item
+
+
+def test__convert_floats_to_decimals__nested_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    leaf: Dict[str, Any] = {"v": 10.5}
+    item = leaf
+    for _ in range(depth):
+        item = {"a": [item]}
+
+    convert_floats_to_decimals(item)
+    assert type(leaf["v"]) is Decimal
+    convert_decimals_to_floats(item)
+    assert type(leaf["v"]) is float
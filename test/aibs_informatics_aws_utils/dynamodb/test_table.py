@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from functools import cached_property
+from typing import List, Optional
 
-import moto
 import pytest
 from aibs_informatics_core.env import EnvBase
 from aibs_informatics_core.models.base import (
@@ -45,6 +45,15 @@ from test.aibs_informatics_aws_utils.base import AwsBaseTest
 
 SIMPLE_TABLE_NAME = "simple-table"
 
+# Default field values of test entries (datetimes are immutable, so parse once)
+DEFAULT_ENTRY_DICT = dict(
+    primary_key="primary_key",
+    str_attr="str_attr",
+    int_attr=1,
+    float_attr=1.0,
+    datetime_attr=from_isoformat_8601("2021-01-01T00:00:00.000+00:00"),
+)
+
 
 class SimpleKeyName(DBKeyNameEnum):
     PRIMARY_KEY = "primary_key"
@@ -116,7 +125,7 @@ def test__check_index_supports_strongly_consistent_read__works():
         check_index_supports_strongly_consistent_read(SimpleIndex.STR_DT_INDEX)
 
 
-@moto.mock_aws
+@pytest.mark.usefixtures("shared_mock_aws_fixture")
 class SimpleTableTests(AwsBaseTest):
     def setUp(self) -> None:
         super().setUp()
@@ -127,6 +136,12 @@ class SimpleTableTests(AwsBaseTest):
     def setUpTable(self, env_base: Optional[EnvBase] = None) -> SimpleTable:
         table = SimpleTable(env_base or self.env_base)
 
+        if table.table_name in self.ddb.list_tables()["TableNames"]:
+            # The moto backend is shared by all tests of this class, so the table (and its
+            # indexes) is created once and only emptied between tests.
+            self.clearTable(table)
+            return table
+
         self.ddb.create_table(
             TableName=table.table_name,
             KeySchema=[
@@ -168,11 +183,23 @@ class SimpleTableTests(AwsBaseTest):
 
         return table
 
-    @property
+    def clearTable(self, table: SimpleTable):
+        key_name = SimpleKeyName.PRIMARY_KEY.value
+        paginator = self.ddb.get_paginator("scan")
+        with self.ddb_resource.Table(table.table_name).batch_writer() as batch:
+            for page in paginator.paginate(
+                TableName=table.table_name,
+                ProjectionExpression="#k",
+                ExpressionAttributeNames={"#k": key_name},
+            ):
+                for item in page["Items"]:
+                    batch.delete_item(Key={key_name: item[key_name]["S"]})
+
+    @cached_property
     def ddb(self):
         return get_dynamodb_client(region=self.DEFAULT_REGION)
 
-    @property
+    @cached_property
     def ddb_resource(self):
         return get_dynamodb_resource(region=self.DEFAULT_REGION)
 
@@ -185,11 +212,17 @@ class SimpleTableTests(AwsBaseTest):
         new_entry = self.table.get(entry.primary_key)
         self.assertEqual(entry, new_entry)
 
+    def test__update__upserts_and_returns_item(self):
+        entry = self.create_entry()
+        key = self.table.build_key_from_entry(entry)
+        # update_item upserts and returns the stored item (ALL_NEW) in the same round trip
+        new_entry = self.table.update(key, entry)
+        self.assertEqual(entry, new_entry)
+
     def test__put__batch_get__works(self):
         entry1 = self.create_entry(primary_key="primary_key1", str_attr="str_attr1")
         entry2 = self.create_entry(primary_key="primary_key2", str_attr="str_attr2")
-        self.table.put(entry1)
-        self.table.put(entry2)
+        self.bulk_put([entry1, entry2])
         new_entries = self.table.batch_get([entry1.primary_key, entry2.primary_key])
         self.assertEqual(new_entries, [entry1, entry2])
 
@@ -237,85 +270,58 @@ class SimpleTableTests(AwsBaseTest):
 
     def test__batch_get__fails_for_some_missing_values(self):
         entry = self.create_entry(primary_key="primary_key1", str_attr="str_attr1")
-        self.table.put(entry)
+        self.bulk_put([entry])
         with self.assertRaises(DBReadException):
             self.table.batch_get(["primary_key1", "primary_key2"])
 
     def test__query__expect_non_empty__expect_unique__work_as_intented(self):
-        [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(3)
-        ]
-        # expect_non_empty tests
-        # expect_non_empty=False
-        actual = self.table.query(
+        self.seed_entries(3)
+        no_match_kwargs = dict(
             index=SimpleIndex.STR_INT_INDEX,
             partition_key="str_attr",
             sort_key_condition_expression=Key("int_attr").between(-1, -1),
             filters=[Attr("float_attr").eq(Decimal("-1.0"))],
-            expect_non_empty=False,
-            expect_unique=False,
         )
-        self.assertEqual(len(actual), 0)
-
-        # expect_non_empty=True
-        with self.assertRaises(EmptyQueryResultException):
-            self.table.query(
-                index=SimpleIndex.STR_INT_INDEX,
-                partition_key="str_attr",
-                sort_key_condition_expression=Key("int_attr").between(-1, -1),
-                filters=[Attr("float_attr").eq(Decimal(-1.0))],
-                expect_non_empty=True,
-                expect_unique=False,
-            )
-
-        # expect_non_empty tests
-        # expect_non_empty=False
-        actual = self.table.query(
+        two_matches_kwargs = dict(
             index=SimpleIndex.STR_INT_INDEX,
             partition_key="str_attr",
             sort_key_condition_expression=Key("int_attr").between(0, 1),
             filters=[Attr("float_attr").ne(Decimal("0.0"))],
-            expect_non_empty=False,
-            expect_unique=False,
         )
-        self.assertEqual(len(actual), 2)
 
-        # expect_non_empty=True
-        with self.assertRaises(NonUniqueQueryResultException):
-            self.table.query(
-                index=SimpleIndex.STR_INT_INDEX,
-                partition_key="str_attr",
-                sort_key_condition_expression=Key("int_attr").between(0, 1),
-                filters=[Attr("float_attr").ne(Decimal("0.0"))],
-                expect_non_empty=False,
-                expect_unique=True,
+        with self.subTest("no matches, expect_non_empty=False"):
+            actual = self.table.query(
+                **no_match_kwargs, expect_non_empty=False, expect_unique=False
             )
+            self.assertEqual(len(actual), 0)
 
-    def test__query__fills_in_values_for_partial_gsi(self):
-        entries = [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
+        with self.subTest("no matches, expect_non_empty=True"):
+            with self.assertRaises(EmptyQueryResultException):
+                self.table.query(**no_match_kwargs, expect_non_empty=True, expect_unique=False)
+
+        with self.subTest("two matches, expect_unique=False"):
+            actual = self.table.query(
+                **two_matches_kwargs, expect_non_empty=False, expect_unique=False
             )
-            for i in range(10)
-        ]
-        expected = entries[:5]
+            self.assertEqual(len(actual), 2)
+
+        with self.subTest("two matches, expect_unique=True"):
+            with self.assertRaises(NonUniqueQueryResultException):
+                self.table.query(**two_matches_kwargs, expect_non_empty=False, expect_unique=True)
+
+    def test__query__fills_in_values_for_partial_gsi(self):
+        # One entry more than the sort key range selects, so the condition still filters
+        entries = self.seed_entries(3)
+        expected = entries[:2]
         actual = self.table.query(
             index=SimpleIndex.STR_INT_INDEX,
             partition_key="str_attr",
-            sort_key_condition_expression=Key("int_attr").between(0, 4),
+            sort_key_condition_expression=Key("int_attr").between(0, 1),
         )
         self.assertListEqual(expected, actual)
 
     def test__query__handles_no_sort_key(self):
-        entries = [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(10)
-        ]
+        entries = self.seed_entries(3)
         actual = self.table.query(
             index=SimpleIndex.STR_INT_INDEX,
             partition_key=Key("str_attr").eq("str_attr"),
@@ -340,22 +346,12 @@ class SimpleTableTests(AwsBaseTest):
             )
 
     def test__scan__no_filters_returns_all(self):
-        entries = [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(3)
-        ]
+        entries = self.seed_entries(3)
         actual = self.table.scan()
         self.assertEqual(len(entries), len(actual))
 
     def test__scan__expect_non_empty__expect_unique__work_as_intented(self):
-        [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(3)
-        ]
+        self.seed_entries(3)
         # expect_non_empty tests
         # expect_non_empty=False
         actual = self.table.scan(
@@ -400,12 +396,7 @@ class SimpleTableTests(AwsBaseTest):
             )
 
     def test__smart_query__no_args_does_scan(self):
-        entries = [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(5)
-        ]
+        entries = self.seed_entries(5)
         actual = self.table.smart_query()
         self.assertEqual(len(actual), len(entries))
 
@@ -414,22 +405,12 @@ class SimpleTableTests(AwsBaseTest):
             self.table.smart_query(allow_scan=False)
 
     def test__smart_query__only_attributes_does_scan(self):
-        [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(5)
-        ]
+        self.seed_entries(5)
         actual = self.table.smart_query(int_attr=1)
         self.assertEqual(len(actual), 1)
 
     def test__smart_query__only_key_attributes_does_query(self):
-        [
-            self.table.put(
-                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
-            )
-            for i in range(5)
-        ]
+        self.seed_entries(5)
         actual = self.table.smart_query(str_attr="str_attr", int_attr=1)
         self.assertEqual(len(actual), 1)
 
@@ -452,7 +433,14 @@ class SimpleTableTests(AwsBaseTest):
             self.table.delete({"primary_key": "primary_key"}, error_on_nonexistent=True)
 
     def test__build_key_from_item__works(self):
-        entry_dict = self.create_entry().to_dict()
+        # Serialized form of `self.create_entry()` (what `to_dict()` returns)
+        entry_dict = {
+            "primary_key": "primary_key",
+            "str_attr": "str_attr",
+            "int_attr": 1,
+            "float_attr": 1.0,
+            "datetime_attr": "2021-01-01T00:00:00+00:00",
+        }
         self.assertDictEqual(
             self.table.build_key_from_item(entry_dict), {"primary_key": "primary_key"}
         )
@@ -474,16 +462,32 @@ class SimpleTableTests(AwsBaseTest):
     def test__from_env__works(self):
         SimpleTable.from_env()
 
-    def create_entry(self, **kwargs) -> SimpleModel:
-        entry_dict = dict(
-            primary_key="primary_key",
-            str_attr="str_attr",
-            int_attr=1,
-            float_attr=1.0,
-            datetime_attr=from_isoformat_8601("2021-01-01T00:00:00.000+00:00"),
+    def bulk_put(self, entries: List[SimpleModel]) -> List[SimpleModel]:
+        """Seed the table with entries using one BatchWriteItem per 25 items"""
+        with self.ddb_resource.Table(self.table.table_name).batch_writer() as batch:
+            for entry in entries:
+                batch.put_item(Item=self.table.build_item(entry))
+        return entries
+
+    def seed_entries(self, n: int) -> List[SimpleModel]:
+        """Bulk put n entries sharing `str_attr`, with `int_attr` 0..n-1"""
+        return self.bulk_put(
+            [
+                self.create_entry(primary_key=f"primary_key_{i}", str_attr="str_attr", int_attr=i)
+                for i in range(n)
+            ]
         )
-        entry_dict.update(kwargs)
-        return SimpleModel.from_dict(entry_dict)
+
+    def create_entry(self, **kwargs) -> SimpleModel:
+        return SimpleModel.from_dict({**DEFAULT_ENTRY_DICT, **kwargs})
+
+
+# Conditions shared by the build_optimized_condition_expression_set params
+PK_EQ = Key("primary_key").eq("primary_key")
+STR_ATTR_EQ = Key("str_attr").eq("str_attr")
+FLOAT_ATTR_EQ = Key("float_attr").eq(Decimal("1.0"))
+INT_ATTR_GT_1 = Key("int_attr").gt(1)
+INT_ATTR_BETWEEN_1_AND_3 = Attr("int_attr").gt(1) & Attr("int_attr").lt(3)
 
 
 @pytest.mark.parametrize(
@@ -499,21 +503,21 @@ class SimpleTableTests(AwsBaseTest):
         ),
         pytest.param(
             SimpleIndex,
-            [Key("float_attr").eq(Decimal("1.0"))],
+            [FLOAT_ATTR_EQ],
             {},
-            (None, None, None, [Key("float_attr").eq(Decimal("1.0"))]),
+            (None, None, None, [FLOAT_ATTR_EQ]),
             does_not_raise(),
             id="only args with only filter expressions as condition (SCAN)",
         ),
         pytest.param(
             SimpleIndex,
-            [Key("float_attr").eq(Decimal("1.0"))],
+            [FLOAT_ATTR_EQ],
             {"float_attr": Decimal("1.0")},
             (
                 None,
                 None,
                 None,
-                [Attr("float_attr").eq(Decimal("1.0")), Key("float_attr").eq(Decimal("1.0"))],
+                [Attr("float_attr").eq(Decimal("1.0")), FLOAT_ATTR_EQ],
             ),
             does_not_raise(),
             id="only kwargs with only filter expressions with duplicates (SCAN)",
@@ -522,15 +526,15 @@ class SimpleTableTests(AwsBaseTest):
             SimpleIndex,
             [{"primary_key": "primary_key"}],
             {},
-            (SimpleIndex.PRIMARY_KEY, Key("primary_key").eq("primary_key"), None, []),
+            (SimpleIndex.PRIMARY_KEY, PK_EQ, None, []),
             does_not_raise(),
             id="only args with one partition key as dict (QUERY)",
         ),
         pytest.param(
             SimpleIndex,
-            [Key("primary_key").eq("primary_key")],
+            [PK_EQ],
             {},
-            (SimpleIndex.PRIMARY_KEY, Key("primary_key").eq("primary_key"), None, []),
+            (SimpleIndex.PRIMARY_KEY, PK_EQ, None, []),
             does_not_raise(),
             id="only args with one partition key as condition (QUERY)",
         ),
@@ -538,7 +542,7 @@ class SimpleTableTests(AwsBaseTest):
             SimpleIndex,
             [],
             {"primary_key": "primary_key"},
-            (SimpleIndex.PRIMARY_KEY, Key("primary_key").eq("primary_key"), None, []),
+            (SimpleIndex.PRIMARY_KEY, PK_EQ, None, []),
             does_not_raise(),
             id="only kwargs with one partition key as dict (QUERY)",
         ),
@@ -548,9 +552,9 @@ class SimpleTableTests(AwsBaseTest):
             {},
             (
                 SimpleIndex.PRIMARY_KEY,
-                Key("primary_key").eq("primary_key"),
+                PK_EQ,
                 None,
-                [Key("str_attr").eq("str_attr")],
+                [STR_ATTR_EQ],
             ),
             does_not_raise(),
             id="only args with competing keys for indices",
@@ -561,7 +565,7 @@ class SimpleTableTests(AwsBaseTest):
             {},
             (
                 SimpleIndex.STR_INT_INDEX,
-                Key("str_attr").eq("str_attr"),
+                STR_ATTR_EQ,
                 None,
                 [Key("datetime_attr").eq("date")],
             ),
@@ -571,16 +575,16 @@ class SimpleTableTests(AwsBaseTest):
         pytest.param(
             [SimpleIndex.STR_INT_INDEX, SimpleIndex.PRIMARY_KEY],
             [
-                Key("primary_key").eq("primary_key"),
-                Key("str_attr").eq("str_attr"),
-                Key("int_attr").gt(1),
+                PK_EQ,
+                STR_ATTR_EQ,
+                INT_ATTR_GT_1,
             ],
             {"str_attr": "str_attr"},
             (
                 SimpleIndex.STR_INT_INDEX,
-                Key("str_attr").eq("str_attr"),
-                Key("int_attr").gt(1),
-                [Key("primary_key").eq("primary_key")],
+                STR_ATTR_EQ,
+                INT_ATTR_GT_1,
+                [PK_EQ],
             ),
             does_not_raise(),
             id="args/kwargs with competing keys and index order specified (QUERY)",
@@ -588,15 +592,15 @@ class SimpleTableTests(AwsBaseTest):
         pytest.param(
             SimpleIndex,
             [
-                Key("str_attr").eq("str_attr"),
-                Attr("int_attr").gt(1) & Attr("int_attr").lt(3),
+                STR_ATTR_EQ,
+                INT_ATTR_BETWEEN_1_AND_3,
             ],
             {},
             (
                 SimpleIndex.STR_DT_INDEX,
-                Key("str_attr").eq("str_attr"),
+                STR_ATTR_EQ,
                 None,
-                [Attr("int_attr").gt(1) & Attr("int_attr").lt(3)],
+                [INT_ATTR_BETWEEN_1_AND_3],
             ),
             does_not_raise(),
             id="args with complex conditions and index order specified (QUERY)",
@@ -605,17 +609,17 @@ class SimpleTableTests(AwsBaseTest):
             SimpleIndex,
             [
                 {"primary_key": "primary_key"},
-                Key("primary_key").eq("primary_key"),
+                PK_EQ,
                 Attr("primary_key").eq("primary_key"),
             ],
             {"primary_key": "primary_key"},
-            (SimpleIndex.PRIMARY_KEY, Key("primary_key").eq("primary_key"), None, []),
+            (SimpleIndex.PRIMARY_KEY, PK_EQ, None, []),
             does_not_raise(),
             id="args/kwargs handles duplicate key/values (QUERY)",
         ),
         pytest.param(
             SimpleIndex,
-            [Key("primary_key").eq("primary_key")],
+            [PK_EQ],
             {"primary_key": "something_else"},
             None,
             pytest.raises(DBQueryException),
@@ -623,7 +627,7 @@ class SimpleTableTests(AwsBaseTest):
         ),
         pytest.param(
             SimpleIndex,
-            [Key("primary_key").eq("primary_key"), {"primary_key": "something_else"}],
+            [PK_EQ, {"primary_key": "something_else"}],
             {},
             None,
             pytest.raises(DBQueryException),
@@ -1,11 +1,11 @@
 import hashlib
 import json
 import uuid
+from functools import cached_property
 from typing import TYPE_CHECKING, List, Optional, Union
 
 import boto3
 import moto
-from aibs_informatics_core.utils.tools.dicttools import remove_null_values
 
 from aibs_informatics_aws_utils.core import get_client
 from aibs_informatics_aws_utils.ecr import ECRImage, ECRRepository, ResourceTag
@@ -34,9 +34,12 @@ class ECRTestBase(AwsBaseTest):
         self.set_account_id()
         self.REGION = self.DEFAULT_REGION
         get_client.cache_clear()
+        # Test classes may share one moto backend (see `shared_mock_aws_fixture`), so every
+        # test starts from a registry without repositories.
+        self.delete_repositories()
 
-    @property
-    def ecr(self):
+    @cached_property
+    def ecr(self) -> ECRClient:
         return boto3.client("ecr", region_name=self.REGION)
 
     def construct_image_digest(self, value: Optional[str] = None) -> str:
@@ -88,12 +91,14 @@ class ECRTestBase(AwsBaseTest):
         self,
         repository_name: str,
         image_id: ImageIdentifierTypeDef,
-        image_manifest: Union[str, dict] = None,
+        image_manifest: Union[str, bytes, dict] = None,
     ) -> ImageTypeDef:
         if image_manifest is None:
             image_manifest = self.construct_image_manifest([123])
 
-        if isinstance(image_manifest, dict):
+        if isinstance(image_manifest, bytes):
+            image_manifest = image_manifest.decode("utf-8")
+        elif isinstance(image_manifest, dict):
             image_manifest = json.dumps(image_manifest)
 
         return ImageTypeDef(
@@ -107,15 +112,18 @@ class ECRTestBase(AwsBaseTest):
     def construct_image_identifier(
         self, image_digest: str = None, image_tag: str = None
     ) -> ImageIdentifierTypeDef:
-        return ImageIdentifierTypeDef(
-            remove_null_values(dict(imageDigest=image_digest, imageTag=image_tag))
-        )
+        identifier = ImageIdentifierTypeDef()
+        if image_digest is not None:
+            identifier["imageDigest"] = image_digest
+        if image_tag is not None:
+            identifier["imageTag"] = image_tag
+        return identifier
 
     def create_repository(self, repository_name: str, *repository_tags: ResourceTag):
         self.ecr.create_repository(
             repositoryName=repository_name,
             registryId=self.ACCOUNT_ID,
-            tags=[_ for _ in repository_tags],
+            tags=list(repository_tags),
         )
         return ECRRepository(self.ACCOUNT_ID, self.REGION, repository_name)
 
@@ -143,16 +151,16 @@ class ECRTestBase(AwsBaseTest):
             image_manifest=image_manifest,
         )
 
+        image_id = image.get("imageId", {})
+        put_image_kwargs = {
+            "repositoryName": repository_name,
+            "imageDigest": image_id.get("imageDigest"),
+            "imageManifest": image.get("imageManifest"),
+            "imageTag": image_id.get("imageTag"),
+            "registryId": self.ACCOUNT_ID,
+        }
         response = self.ecr.put_image(
-            **remove_null_values(
-                dict(
-                    repositoryName=repository_name,
-                    imageDigest=image.get("imageId", {}).get("imageDigest"),
-                    imageManifest=image.get("imageManifest"),
-                    imageTag=image.get("imageId", {}).get("imageTag"),
-                    registryId=self.ACCOUNT_ID,
-                )
-            )
+            **{k: v for k, v in put_image_kwargs.items() if v is not None}
         )
         return ECRImage(
             account_id=response["image"].get("registryId"),
@@ -162,6 +170,16 @@ class ECRTestBase(AwsBaseTest):
             image_manifest=response["image"].get("imageManifest"),
         )
 
+    def delete_repositories(self):
+        paginator = self.ecr.get_paginator("describe_repositories")
+        for page in paginator.paginate(registryId=self.ACCOUNT_ID):
+            for repository in page["repositories"]:
+                self.ecr.delete_repository(
+                    repositoryName=repository["repositoryName"],
+                    registryId=self.ACCOUNT_ID,
+                    force=True,
+                )
+
     def remove_image(self, repository_name: str, image_digest: str):
         self.ecr.batch_delete_image(
             repositoryName=repository_name,
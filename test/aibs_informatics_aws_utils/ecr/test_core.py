@@ -1,11 +1,9 @@
 import datetime
 import json
 import re
-from time import sleep
-from typing import Tuple
+from typing import List, Tuple
 from unittest import mock
 
-import moto
 from aibs_informatics_test_resources import does_not_raise
 from pytest import mark, param, raises
 from requests.exceptions import HTTPError
@@ -30,7 +28,7 @@ from test.aibs_informatics_aws_utils.ecr.base import ECRTestBase
 
 
 @mark.parametrize(
-    "input, expected, raises_error",
+    "rule, rule_dict",
     [
         param(
             LifecyclePolicyRule(
@@ -51,43 +49,18 @@ from test.aibs_informatics_aws_utils.ecr.base import ECRTestBase
                     "tagStatus": "untagged",
                 },
             },
-            does_not_raise(),
-            id="valid Lifecycle policy with empty fields is serialized",
+            id="valid Lifecycle policy with empty fields",
         ),
     ],
 )
-def test__LifecyclePolicyRule__to_dict(input, expected, raises_error):
-    with raises_error:
-        actual = input.to_dict()
-
-    assert actual == expected
+def test__LifecyclePolicyRule__to_dict_from_dict__round_trips(rule, rule_dict):
+    assert rule.to_dict() == rule_dict
+    assert LifecyclePolicyRule.from_dict(rule_dict) == rule
 
 
 @mark.parametrize(
-    "input, expected, raises_error",
+    "input",
     [
-        param(
-            {
-                "action": {"type": "expire"},
-                "description": "",
-                "rulePriority": 1,
-                "selection": {
-                    "countNumber": 7,
-                    "countType": "sinceImagePushed",
-                    "countUnit": "days",
-                    "tagPrefixList": [],
-                    "tagStatus": "untagged",
-                },
-            },
-            LifecyclePolicyRule(
-                1,
-                "",
-                LifecyclePolicySelection("untagged", [], "sinceImagePushed", 7, "days"),
-                LifecyclePolicyAction("expire"),
-            ),
-            does_not_raise(),
-            id="valid Lifecycle policy with empty fields deserialized",
-        ),
         param(
             {
                 "action": {"type": "expire"},
@@ -101,8 +74,6 @@ def test__LifecyclePolicyRule__to_dict(input, expected, raises_error):
                     "tagStatus": "untagged",
                 },
             },
-            None,
-            raises(ValueError),
             id="invalid Lifecycle policy with conflicting selection countType/countUnit fields",
         ),
         param(
@@ -118,17 +89,13 @@ def test__LifecyclePolicyRule__to_dict(input, expected, raises_error):
                     "tagStatus": "tagged",
                 },
             },
-            None,
-            raises(ValueError),
             id="invalid Lifecycle policy with conflicting selection tagStatus/tagPrefixList fields",  # noqa: E501
         ),
     ],
 )
-def test__LifecyclePolicyRule__from_dict(input, expected, raises_error):
-    with raises_error:
-        actual = LifecyclePolicyRule.from_dict(input)
-    if expected is not None:
-        assert actual == expected
+def test__LifecyclePolicyRule__from_dict__fails_for_invalid_rule(input):
+    with raises(ValueError):
+        LifecyclePolicyRule.from_dict(input)
 
 
 def test__LifecyclePolicyRule__REMOVE_UNTAGGED__works_as_expected():
@@ -149,96 +116,38 @@ def test__LifecyclePolicyRule__REMOVE_UNTAGGED__works_as_expected():
     assert rule_override.action.type == "expire"
 
 
+def untagged_rule(rule_priority: int, days: int) -> LifecyclePolicyRule:
+    return LifecyclePolicyRule(
+        rule_priority,
+        "",
+        LifecyclePolicySelection("untagged", [], "sinceImagePushed", days, "days"),
+    )
+
+
 @mark.parametrize(
     "rules, expected, raises_error",
     [
         param(
-            [
-                LifecyclePolicyRule(
-                    3,
-                    "",
-                    LifecyclePolicySelection("untagged", [], "sinceImagePushed", 3, "days"),
-                ),
-                LifecyclePolicyRule(
-                    2,
-                    "",
-                    LifecyclePolicySelection("untagged", [], "sinceImagePushed", 2, "days"),
-                ),
-                LifecyclePolicyRule(
-                    1,
-                    "",
-                    LifecyclePolicySelection("untagged", [], "sinceImagePushed", 1, "days"),
-                ),
-            ],
-            LifecyclePolicy(
-                rules=[
-                    LifecyclePolicyRule(
-                        1,
-                        "",
-                        LifecyclePolicySelection("untagged", [], "sinceImagePushed", 1, "days"),
-                    ),
-                    LifecyclePolicyRule(
-                        2,
-                        "",
-                        LifecyclePolicySelection("untagged", [], "sinceImagePushed", 2, "days"),
-                    ),
-                    LifecyclePolicyRule(
-                        3,
-                        "",
-                        LifecyclePolicySelection("untagged", [], "sinceImagePushed", 3, "days"),
-                    ),
-                ]
-            ),
+            [(3, 3), (2, 2), (1, 1)],
+            [(1, 1), (2, 2), (3, 3)],
             does_not_raise(),
             id="valid Lifecycle policy rule priorities not amended",
         ),
         param(
-            [
-                LifecyclePolicyRule(
-                    3,
-                    "",
-                    LifecyclePolicySelection("untagged", [], "sinceImagePushed", 3, "days"),
-                ),
-                LifecyclePolicyRule(
-                    2,
-                    "",
-                    LifecyclePolicySelection("untagged", [], "sinceImagePushed", 2, "days"),
-                ),
-                LifecyclePolicyRule(
-                    3,
-                    "",
-                    LifecyclePolicySelection("untagged", [], "sinceImagePushed", 4, "days"),
-                ),
-            ],
-            LifecyclePolicy(
-                rules=[
-                    LifecyclePolicyRule(
-                        2,
-                        "",
-                        LifecyclePolicySelection("untagged", [], "sinceImagePushed", 2, "days"),
-                    ),
-                    LifecyclePolicyRule(
-                        3,
-                        "",
-                        LifecyclePolicySelection("untagged", [], "sinceImagePushed", 3, "days"),
-                    ),
-                    LifecyclePolicyRule(
-                        4,
-                        "",
-                        LifecyclePolicySelection("untagged", [], "sinceImagePushed", 4, "days"),
-                    ),
-                ]
-            ),
+            [(3, 3), (2, 2), (3, 4)],
+            [(2, 2), (3, 3), (4, 4)],
             does_not_raise(),
             id="valid Lifecycle policy rule priorities amended",
         ),
     ],
 )
-def test__LifecyclePolicy__sorts_rules(rules, expected, raises_error):
+def test__LifecyclePolicy__sorts_rules(
+    rules: List[Tuple[int, int]], expected: List[Tuple[int, int]], raises_error
+):
+    # rules are given as (rule_priority, days) and only constructed for selected tests
     with raises_error:
-        actual = LifecyclePolicy.from_rules(*rules)
-    if expected is not None:
-        assert actual == expected
+        actual = LifecyclePolicy.from_rules(*(untagged_rule(*rule) for rule in rules))
+    assert actual == LifecyclePolicy(rules=[untagged_rule(*rule) for rule in expected])
 
 
 def test__LifecyclePolicy__reprioritize_rules__in_place_works():
@@ -445,11 +354,15 @@ def test__ECRImageUri__from_components__raises_error_with_invalid_args():
         )
 
 
-@moto.mock_aws
+@mark.usefixtures("shared_mock_aws_fixture")
 class ECRImageTests(ECRTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.repo = self.create_repository("repository_name")
+        self.image = self.put_image(self.repo.repository_name, image_tag="latest")
+
     def test__init__with_manifest__does_not_call_ecr_for_info(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         ecr_image = ECRImage(
             account_id=self.ACCOUNT_ID,
             region=self.US_WEST_2,
@@ -460,8 +373,7 @@ class ECRImageTests(ECRTestBase):
         self.assertStringPattern(ECRImageUri.regex_pattern, ecr_image.uri)
 
     def test__init__without_manifest__resolves_image_details_from_ecr(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         ecr_image = ECRImage(
             account_id=self.ACCOUNT_ID,
             region=self.US_WEST_2,
@@ -471,7 +383,7 @@ class ECRImageTests(ECRTestBase):
         self.assertEqual(json.loads(ecr_image.image_manifest), json.loads(image.image_manifest))
 
     def test__init__without_manifest__fails_to_resolve_image_details_from_ecr(self):
-        repo = self.create_repository("repository_name")
+        repo = self.repo
         with self.assertRaises(ResourceNotFoundError):
             ECRImage(
                 account_id=self.ACCOUNT_ID,
@@ -481,109 +393,85 @@ class ECRImageTests(ECRTestBase):
             )
 
     def test__from_uri__with_image_digest_succeeds(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
 
         actual = ECRImage.from_uri(image.uri)
         self.assertEqual(actual, image)
 
     def test__from_uri__with_image_tag_succeeds(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        repo, image = self.repo, self.image
 
         actual = ECRImage.from_uri(repo.uri + ":latest")
         self.assertEqual(actual, image)
 
     def test__from_repository_uri__succeeds(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        repo, image = self.repo, self.image
 
         actual = ECRImage.from_repository_uri(repo.uri, image.image_digest)
         self.assertEqual(actual, image)
 
     def test__get_repository__constructs_repository_object(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        repo, image = self.repo, self.image
         actual = image.get_repository()
         self.assertEqual(actual, repo)
 
     def test__get_image_detail__fails_for_non_existent_image(self):
-        repo = self.create_repository("repository_name")
-        image: ECRImage = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         self.remove_image(image.repository_name, image.image_digest)
         with self.assertRaises(Exception):
             image.get_image_detail()
 
     def test__get_image_tags__returns_tags(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         actual = image.image_tags
         self.assertListEqual(actual, ["latest"])
 
     def test__add_image_tags__adds_tags(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         self.assertListEqual(image.image_tags, ["latest"])
         image.add_image_tags("latest", "v2")
 
         self.assertListEqual(image.image_tags, ["latest", "v2"])
 
     def test__add_image_tags__fails(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        repo, image = self.repo, self.image
         self.assertListEqual(image.image_tags, ["latest"])
         with self.assertRaises(Exception):
             repo.delete(True)
             image.add_image_tags("latest")
 
     def test__put_image__handles_no_tag(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         self.assertListEqual(image.image_tags, ["latest"])
         image.put_image(None)
         self.assertListEqual(image.image_tags, ["latest"])
 
     def test__get_image_layers__gets_layers_from_manifest(self):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+        image = self.image
         image_layers = image.get_image_layers()
         manifest = json.loads(image.image_manifest)
         manifest_layers = manifest["layers"]
         self.assertEqual(len(image_layers), len(manifest_layers))
 
     @mock.patch("requests.get")
-    def test__get_image_config__returns_dict(self, mock_get):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
+    def test__get_image_config__handles_response(self, mock_get):
+        image = self.image
 
-        # setup
-        class MockResponse:
-            raise_for_status = mock.Mock()
-            json = mock.Mock(return_value={"key1": "value1"})
+        response = mock.Mock()
+        mock_get.return_value = response
 
-        mock_get.return_value = MockResponse
+        with self.subTest("returns dict"):
+            response.raise_for_status.side_effect = None
+            response.json.return_value = {"key1": "value1"}
+            self.assertEqual(image.get_image_config(), {"key1": "value1"})
 
-        image_config = image.get_image_config()
+        with self.subTest("raises HTTPError"):
+            response.raise_for_status.side_effect = HTTPError("Request Failed")
+            with self.assertRaises(HTTPError):
+                image.get_image_config()
 
-        self.assertEqual(image_config, {"key1": "value1"})
 
-    @mock.patch("requests.get")
-    def test__get_image_config__raises_HTTPError(self, mock_get):
-        repo = self.create_repository("repository_name")
-        image = self.put_image(repo.repository_name, image_tag="latest")
-
-        # setup
-        class MockResponse:
-            raise_for_status = mock.Mock(side_effect=HTTPError("Request Failed"))
-            json = mock.Mock()
-
-        mock_get.return_value = MockResponse
-
-        with self.assertRaises(HTTPError):
-            image.get_image_config()
-
-
-@moto.mock_aws
+@mark.usefixtures("shared_mock_aws_fixture")
 class ECRRegistryTests(ECRTestBase):
     def test__get_ecr_login__works(self):
         registry = ECRRegistry(self.ACCOUNT_ID, self.REGION)
@@ -684,7 +572,7 @@ class ECRRegistryTests(ECRTestBase):
         self.assertListEqual(actual, expected)
 
 
-@moto.mock_aws
+@mark.usefixtures("shared_mock_aws_fixture")
 class ECRRepositoryTests(ECRTestBase):
     def test__from_uri__succeeds(self):
         ecr_repo = ECRRepository(
@@ -838,13 +726,12 @@ class ECRRepositoryTests(ECRTestBase):
         self.assertEqual(resolve_image_uri(repo.repository_name), image1.uri)
         self.assertEqual(resolve_image_uri(repo.uri), image1.uri)
 
-        # wait for 1.1 seconds to ensure that the image pushed at time is different
-        # Moto does not support time resolution less than 1 second
-        sleep(
-            (image1.image_pushed_at + datetime.timedelta(seconds=1.5)).timestamp()
-            - datetime.datetime.now().timestamp()
-        )
-        image2 = self.put_image(repo.repository_name, image_tag="v2", seed=234)
+        # Moto records push times with 1 second resolution, so push the second image with an
+        # advanced clock rather than waiting for the pushed at time to differ.
+        later = image1.image_pushed_at + datetime.timedelta(seconds=2)
+        with mock.patch("moto.ecr.models.datetime", wraps=datetime.datetime) as mock_datetime:
+            mock_datetime.now.return_value = later
+            image2 = self.put_image(repo.repository_name, image_tag="v2", seed=234)
         self.assertEqual(resolve_image_uri(repo.repository_name), image2.uri)
         self.assertEqual(resolve_image_uri(repo.uri), image2.uri)
 
@@ -11,8 +11,12 @@ from test.aibs_informatics_aws_utils.base import AwsBaseTest
 
 
 class EFSTestsBase(AwsBaseTest):
-    def setUp(self) -> None:
-        super().setUp()
+    # If configs need to be overridden, they can be set via this attribute on the child class.
+    mock_aws_config: Optional[moto.core.config.DefaultConfig] = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
 
         # HACK: We must define moto.mock_aws here instead of as a decorator because moto gives us
         #       issues when we try to use the moto.mock_aws decorator in the child classes
@@ -20,22 +24,22 @@ class EFSTestsBase(AwsBaseTest):
         #       We previously double decorated - decorating the child and parent class - but this
         #       now fails in python 3.12 (perhaps cleanup of mock collisions leniency).
         #
-        #       This is a workaround until we can find a better solution. If configs need to be
-        #       overridden, they can be passed in via the mock_aws_config property on the child
-        #       class.
-        self.mock_efs = moto.mock_aws(config=self.mock_aws_config)
-        self.mock_efs.start()
+        #       Starting and stopping the mock patches botocore each time, so it is done once per
+        #       class. Backends are reset in setUp so tests remain isolated from one another.
+        cls.mock_efs = moto.mock_aws(config=cls.mock_aws_config)
+        cls.mock_efs.start()
 
-        self.set_aws_credentials()
-        self._file_store_name_id_map: Dict[str, str] = {}
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.mock_efs.stop()
+        super().tearDownClass()
 
-    def tearDown(self) -> None:
-        super().tearDown()
-        self.mock_efs.stop()
+    def setUp(self) -> None:
+        super().setUp()
+        self.mock_efs.reset()
 
-    @property
-    def mock_aws_config(self) -> Optional[moto.core.config.DefaultConfig]:
-        return None
+        self.set_aws_credentials()
+        self._file_store_name_id_map: Dict[str, str] = {}
 
     @property
     def efs_client(self):
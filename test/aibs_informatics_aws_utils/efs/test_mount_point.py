@@ -29,9 +29,10 @@ class MountPointConfigurationTests(EFSTestsBase):
         super().setUp()
         detect_mount_points.cache_clear()
 
-    @property
-    def mock_aws_config(self) -> Optional[DefaultConfig]:
-        return {"batch": {"use_docker": False}, "core": {"reset_boto3_session": True}}
+    mock_aws_config: Optional[DefaultConfig] = {
+        "batch": {"use_docker": False},
+        "core": {"reset_boto3_session": True},
+    }
 
     def setUpEFS(self, *access_points: Tuple[str, Path], file_system_name: Optional[str] = None):
         self.create_file_system(file_system_name)
@@ -24,6 +24,29 @@ def aws_credentials_fixture():
         yield
 
 
+@pytest.fixture(scope="class")
+def shared_mock_aws_fixture():
+    """Start a single moto mock shared by all tests of a class.
+
+    Starting moto patches botocore, which is a noticeable fixed cost per test. Tests using
+    this fixture share one in-memory backend, so they must namespace their resources
+    (e.g. unique bucket names) rather than rely on a clean backend.
+    """
+    with moto.mock_aws():
+        yield
+
+
+@pytest.fixture(scope="class")
+def tmp_factory_fixture(request, tmp_path_factory):
+    """Expose pytest's session-scoped `tmp_path_factory` to unittest-style test classes.
+
+    Tests can then create per-test directories under one shared session root with a
+    single mkdir (`self.tmp_factory.mktemp(...)`) instead of a full tempdir lifecycle.
+    """
+    request.cls.tmp_factory = tmp_path_factory
+    yield
+
+
 @pytest.fixture
 def s3_client_fixture(aws_credentials_fixture):
     with moto.mock_aws():